@@ -45,7 +45,7 @@ cache.init_app(
     app.server,
     config={
         "CACHE_TYPE": "filesystem",
-        "CACHE_DIR": ".cache",
+        "CACHE_DIR": settings["CACHE_DIR"],
     },
 )
 
@@ -1,4 +1,5 @@
 from pastasdash.application.callbacks.compare import register_compare_callbacks
+from pastasdash.application.callbacks.export import register_export_routes
 from pastasdash.application.callbacks.general import register_general_callbacks
 from pastasdash.application.callbacks.maps import register_maps_callbacks
 from pastasdash.application.callbacks.model import register_model_callbacks
@@ -23,3 +24,4 @@ def register_callbacks(app, pstore):
     register_model_callbacks(app, pstore)
     register_compare_callbacks(app, pstore)
     register_maps_callbacks(app, pstore)
+    register_export_routes(app, pstore)
@@ -2,13 +2,18 @@ from itertools import chain
 
 import pandas as pd
 import pastas as ps
-from dash import Input, Output, State, ctx
+from dash import Input, Output, State, ctx, no_update
 from dash.dash_table.Format import Format
 from dash.exceptions import PreventUpdate
 
 from pastasdash.application.components.compare.chart import plot_model_comparison
-from pastasdash.application.components.overview.mapview import plot_mapview
+from pastasdash.application.components.overview.mapview import (
+    get_selected_names,
+    patch_mapview_selection,
+    patch_mapview_viewport,
+)
 from pastasdash.application.components.shared import ids, styling
+from pastasdash.application.settings import settings
 
 
 def register_compare_callbacks(app, pstore):
@@ -37,20 +42,47 @@ def register_compare_callbacks(app, pstore):
 
         Returns
         -------
-        dict
-            map layout and mapdata dictionary zoomed to selected location(s)
+        Patch
+            patch updating selected points and zooming map to selected location(s)
         """
         # zoom to oseries in selected cell in datatable
         if selected_cells:
             selected_row_ids = [d["row_id"] for d in selected_cells]
-            return plot_mapview(
-                pstore,
-                selected_data=selected_row_ids,
-                update_extent=True,
-            )
+            return patch_mapview_selection(pstore, selected_row_ids)
         else:
             raise PreventUpdate
 
+    @app.callback(
+        Output(ids.COMPARE_MAP, "figure", allow_duplicate=True),
+        Input(ids.COMPARE_MAP, "relayoutData"),
+        State(ids.COMPARE_METADATA_TABLE, "selected_cells"),
+        prevent_initial_call=True,
+    )
+    def update_map_viewport(relayout_data, selected_cells):
+        """Update points and clusters in view when map is moved or zoomed.
+
+        Only applies if map points are clustered.
+
+        Parameters
+        ----------
+        relayout_data : dict
+            relayout data of the map
+        selected_cells : list of dict
+            list of selected rows
+
+        Returns
+        -------
+        Patch
+            patch updating the points and clusters in the map
+        """
+        selected_row_ids = (
+            None if not selected_cells else [d["row_id"] for d in selected_cells]
+        )
+        patch = patch_mapview_viewport(pstore, selected_row_ids, relayout_data)
+        if patch is None:
+            raise PreventUpdate
+        return patch
+
     @app.callback(
         Output(ids.COMPARE_METADATA_TABLE, "data"),
         Output(ids.COMPARE_METADATA_TABLE, "selected_rows", allow_duplicate=True),
@@ -75,18 +107,13 @@ def register_compare_callbacks(app, pstore):
         """
         oseries = pstore.oseries.copy()
         if data is not None:
-            # set data
-
-            # get selection
-            if data is not None:
-                pts = pd.DataFrame(data["points"])
-            else:
-                pts = None
-
-            # get selected points
-            if pts is not None and not pts.empty:
-                idx = pts.loc[pts.curveNumber == 0, "pointNumber"].values
-                oseries = oseries.reset_index(drop=("name" in oseries.columns)).set_index("id").loc[idx].reset_index()
+            # get selected oseries, box and lasso selections are resolved using
+            # the spatial index
+            names = get_selected_names(pstore, data)
+            if names is not None:
+                oseries = oseries.loc[names].reset_index(
+                    drop=("name" in oseries.columns)
+                )
 
             table = oseries.to_dict("records")
             selected_rows = [i for i, _ in enumerate(table)]
@@ -154,7 +181,7 @@ def register_compare_callbacks(app, pstore):
         else:
             ml = pstore.get_models(value)
             if ml is not None:
-                chart = plot_model_comparison(ml)
+                chart = plot_model_comparison(ml, pstore=pstore)
                 return chart
             else:
                 return {"layout": {"title": "No model selected or found!"}}
@@ -189,8 +216,7 @@ def register_compare_callbacks(app, pstore):
         else:
             params = []
             columns = [{"id": "parameter", "name": "Parameter", "type": "text"}]
-            for val in value:
-                ml = pstore.get_models(val)
+            for val, ml in zip(value, pstore.get_bulk("models", value), strict=True):
                 pdf = ml.parameters.loc[:, "optimal"].to_frame()
                 pdf.columns = [val]
                 params.append(pdf)
@@ -304,3 +330,129 @@ def register_compare_callbacks(app, pstore):
             return [], []
         else:
             raise PreventUpdate
+
+    @app.callback(
+        Output(ids.COMPARE_BATCH_SOLVE_JOB_STORE, "data"),
+        Output(ids.COMPARE_BATCH_SOLVE_INTERVAL, "disabled"),
+        Output(ids.COMPARE_BATCH_SOLVE_BUTTON, "disabled"),
+        Output(ids.COMPARE_BATCH_SOLVE_TABLE, "data"),
+        Output(ids.ALERT_BATCH_SOLVE, "data"),
+        Input(ids.COMPARE_BATCH_SOLVE_BUTTON, "n_clicks"),
+        State(ids.COMPARE_METADATA_TABLE, "selected_row_ids"),
+        prevent_initial_call=True,
+    )
+    def batch_solve_selected_models(n_clicks, sel):
+        """Start solving all models of the selected observation wells.
+
+        Parameters
+        ----------
+        n_clicks : int
+            number of clicks on the batch solve button
+        sel : list
+            list of selected locations from datatable
+
+        Returns
+        -------
+        tuple
+            job identifier, whether polling and the button are disabled, empty
+            results table and alert data
+        """
+        if not n_clicks:
+            raise PreventUpdate
+        names = []
+        if sel not in [None, []]:
+            mask = pstore.oseries["id"].isin(sel)
+            names = chain.from_iterable(
+                pstore.oseries_models.get(n, []) for n in pstore.oseries.index[mask]
+            )
+            names = list(names)
+        if len(names) == 0:
+            return (
+                no_update,
+                no_update,
+                no_update,
+                no_update,
+                (True, "warning", "No models found for the selected wells."),
+            )
+        try:
+            job_id = pstore.batch_solver.start(
+                names, warm_start=settings["SOLVE_WARM_START"]
+            )
+        except Exception as e:
+            return no_update, no_update, no_update, no_update, (True, "danger", str(e))
+        return job_id, False, True, [], no_update
+
+    @app.callback(
+        Output(ids.COMPARE_BATCH_SOLVE_PROGRESS, "value"),
+        Output(ids.COMPARE_BATCH_SOLVE_PROGRESS, "label"),
+        Output(ids.COMPARE_BATCH_SOLVE_PROGRESS_DIV, "style"),
+        Output(ids.COMPARE_BATCH_SOLVE_CANCEL_BUTTON, "disabled"),
+        Output(ids.COMPARE_BATCH_SOLVE_INTERVAL, "disabled", allow_duplicate=True),
+        Output(ids.COMPARE_BATCH_SOLVE_BUTTON, "disabled", allow_duplicate=True),
+        Output(ids.COMPARE_BATCH_SOLVE_TABLE, "data", allow_duplicate=True),
+        Output(ids.ALERT_BATCH_SOLVE, "data", allow_duplicate=True),
+        Input(ids.COMPARE_BATCH_SOLVE_INTERVAL, "n_intervals"),
+        State(ids.COMPARE_BATCH_SOLVE_JOB_STORE, "data"),
+        prevent_initial_call=True,
+    )
+    def update_batch_solve_progress(n_intervals, job_id):
+        """Show progress and per-model results of the batch solve.
+
+        Parameters
+        ----------
+        n_intervals : int
+            number of times the progress was polled
+        job_id : str
+            identifier of the batch solve
+
+        Returns
+        -------
+        tuple
+            progress value and label, style of the progress bar, whether the
+            cancel button, interval and batch solve button are disabled, results
+            table and alert data
+        """
+        progress = pstore.batch_solver.progress(job_id)
+        results = pstore.batch_solver.results(job_id)
+        if progress is not None and progress["status"] == "running":
+            done, total = progress["done"], progress["total"]
+            return (
+                100 * done / total if total > 0 else 0,
+                f"Solved {done}/{total} models ({progress['elapsed']:.0f} s)",
+                {"display": "block"},
+                False,
+                no_update,
+                True,
+                results,
+                no_update,
+            )
+
+        if progress is None:
+            alert = (True, "warning", "Batch solve was interrupted.")
+        elif progress["status"] == "failed":
+            alert = (True, "danger", f"Batch solve failed: {progress['error']}")
+        else:
+            n_solved = progress["done"] - progress["failed"]
+            alert = (
+                True,
+                "success" if progress["failed"] == 0 else "warning",
+                (
+                    f"Solved and saved {n_solved} of {progress['total']} models "
+                    f"in {progress['elapsed']:.0f} s, {progress['failed']} failed"
+                    + (" (cancelled)." if progress["status"] == "cancelled" else ".")
+                ),
+            )
+        return 0, "", {"display": "none"}, True, True, False, results, alert
+
+    @app.callback(
+        Output(ids.COMPARE_BATCH_SOLVE_CANCEL_BUTTON, "disabled", allow_duplicate=True),
+        Input(ids.COMPARE_BATCH_SOLVE_CANCEL_BUTTON, "n_clicks"),
+        State(ids.COMPARE_BATCH_SOLVE_JOB_STORE, "data"),
+        prevent_initial_call=True,
+    )
+    def cancel_batch_solve(n_clicks, job_id):
+        if n_clicks:
+            pstore.batch_solver.cancel(job_id)
+            return True
+        else:
+            raise PreventUpdate
@@ -0,0 +1,134 @@
+import io
+import tempfile
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+from flask import Response, abort, request, send_file, stream_with_context
+
+from pastasdash.application.components.maps.mapview import get_map_data, parse_value
+
+EXPORT_ROUTE = "/export/mapdata"
+CSV_CHUNKSIZE = 10_000
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "gpkg": "application/geopackage+sqlite3",
+}
+
+
+def iter_csv(df, chunksize=CSV_CHUNKSIZE):
+    """Yield DataFrame as CSV in chunks of rows.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        data to export
+    chunksize : int, optional
+        number of rows per chunk, by default 10000
+
+    Yields
+    ------
+    str
+        CSV text, the first chunk includes the header
+    """
+    yield df.iloc[:0].to_csv(index=False)
+    for i in range(0, df.index.size, chunksize):
+        yield df.iloc[i : i + chunksize].to_csv(index=False, header=False)
+
+
+def to_geopackage(df, x, y, crs, layer="mapdata"):
+    """Write DataFrame with point locations to GeoPackage.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        data to export
+    x : str
+        name of the column containing the x-coordinates
+    y : str
+        name of the column containing the y-coordinates
+    crs : str
+        coordinate reference system of the coordinates
+    layer : str, optional
+        name of the layer, by default "mapdata"
+
+    Returns
+    -------
+    io.BytesIO
+        GeoPackage file contents
+    """
+    gdf = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df[x], df[y]), crs=crs)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fname = Path(tmpdir) / f"{layer}.gpkg"
+        gdf.to_file(fname, layer=layer, driver="GPKG")
+        return io.BytesIO(fname.read_bytes())
+
+
+def register_export_routes(app, pstore):
+    """Register routes for exporting data from the server.
+
+    Parameters
+    ----------
+    app : object
+        The application instance to which the routes will be registered.
+    pstore : object
+        The pastastore interface that will be used by the routes.
+    """
+
+    @app.server.route(f"{EXPORT_ROUTE}/<fmt>")
+    def export_map_data(fmt):
+        """Export data shown on the results map.
+
+        The value is passed as query parameter, the data is read from the
+        server-side results. If signatures are requested that are not computed
+        yet, their computation is started and 202 is returned.
+        """
+        value = request.args.get("value")
+        if fmt not in EXPORT_MIMETYPES:
+            abort(404)
+        if value is None or value.count(":") != 1:
+            abort(400)
+        try:
+            value_type, v = parse_value(pstore, value)
+        except ValueError:
+            abort(400)
+        if value_type == "signature" and pstore.signatures_pending():
+            # signatures are computed in the background, never in the request
+            pstore.signature_engine.start()
+            return Response(
+                "Signatures are being computed, try again later.",
+                status=202,
+                mimetype="text/plain",
+            )
+        try:
+            data = get_map_data(pstore, value)
+        except ValueError:
+            abort(400)
+
+        timestr = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{timestr}_{value_type}_{v}.{fmt}"
+        if fmt == "csv":
+            return Response(
+                stream_with_context(iter_csv(data)),
+                mimetype=EXPORT_MIMETYPES[fmt],
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            )
+        elif fmt == "parquet":
+            buffer = io.BytesIO()
+            data.to_parquet(buffer, index=False)
+            buffer.seek(0)
+        else:
+            buffer = to_geopackage(
+                data,
+                pstore.column_mapping["x"],
+                pstore.column_mapping["y"],
+                pstore.crs,
+                layer=f"{value_type}_{v}",
+            )
+        return send_file(
+            buffer,
+            mimetype=EXPORT_MIMETYPES[fmt],
+            as_attachment=True,
+            download_name=filename,
+        )
@@ -1,4 +1,5 @@
 import base64
+import uuid
 
 import dash_bootstrap_components as dbc
 import pastastore as pst
@@ -99,10 +100,7 @@ def register_general_callbacks(app, pstore):
                 )
         # render tab content
         if tab == ids.TAB_OVERVIEW:
-            if (
-                selected_data is not None
-                and len(selected_data) > settings["SERIES_LOAD_LIMIT"]
-            ):
+            if pstore.exceeds_point_limit(selected_data):
                 selected_data = None
             return (
                 tabcontainer.tab_overview.render_content(pstore, selected_data),
@@ -110,10 +108,7 @@ def register_general_callbacks(app, pstore):
                 reset_config_file_store,
             )
         elif tab == ids.TAB_MODEL:
-            if (
-                selected_data is not None
-                and len(selected_data) > settings["SERIES_LOAD_LIMIT"]
-            ):
+            if pstore.exceeds_point_limit(selected_data):
                 alert = (
                     True,  # show alert
                     "warning",  # alert color
@@ -146,11 +141,41 @@ def register_general_callbacks(app, pstore):
         else:
             raise PreventUpdate
 
+    @app.callback(
+        Output(ids.SESSION_ID_STORE, "data"),
+        Input(ids.SESSION_ID_STORE, "modified_timestamp"),
+        State(ids.SESSION_ID_STORE, "data"),
+    )
+    def set_session_id(_, session_id):
+        """Assign an identifier to the browser session.
+
+        Used to limit the number of jobs per user.
+
+        Parameters
+        ----------
+        _ : int
+            time the store was last modified
+        session_id : str or None
+            current session identifier
+
+        Returns
+        -------
+        str
+            new session identifier
+        """
+        if session_id is None:
+            return uuid.uuid4().hex
+        raise PreventUpdate
+
     @app.callback(
         Output(ids.ALERT_DIV, "children"),
         Input(ids.ALERT_TAB_RENDER, "data"),
         Input(ids.ALERT_TIME_SERIES_CHART, "data"),
         Input(ids.ALERT_PLOT_MODEL_RESULTS, "data"),
+        Input(ids.ALERT_SOLVE_MODEL, "data"),
+        Input(ids.ALERT_SAVE_MODEL, "data"),
+        Input(ids.ALERT_MAP_SIGNATURES, "data"),
+        Input(ids.ALERT_BATCH_SOLVE, "data"),
         prevent_initial_call=True,
     )
     def show_alert(*args, **kwargs):
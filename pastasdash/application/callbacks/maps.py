@@ -1,9 +1,11 @@
-import pandas as pd
-from dash import Input, Output, State, dcc
+from urllib.parse import urlencode
+
+from dash import Input, Output, State, no_update
 from dash.exceptions import PreventUpdate
 
+from pastasdash.application.callbacks.export import EXPORT_ROUTE
 from pastasdash.application.components.maps.mapview import (
-    get_value_from_pastastore,
+    get_map_data,
     plot_mapview_results,
 )
 from pastasdash.application.components.shared import ids
@@ -29,49 +31,153 @@ def register_maps_callbacks(app, pstore):
         Output(ids.MAPDATA_CMAP_MAX, "value"),
         Output(ids.MAPDATA_CMAP_MIN, "step"),
         Output(ids.MAPDATA_CMAP_MAX, "step"),
+        Output(ids.MAP_SIGNATURE_JOB_STORE, "data"),
+        Output(ids.MAP_SIGNATURE_INTERVAL, "disabled"),
         Input(ids.MAP_RENDER_BUTTON, "n_clicks"),
+        Input(ids.MAP_SIGNATURE_DONE_STORE, "data"),
         State(ids.MAP_DROPDOWN_SELECTION, "value"),
         State(ids.MAP_COLORMAP_SELECTION, "value"),
         State(ids.REVERSE_COLORMAP_CHECKBOX, "value"),
         State(ids.MAPDATA_CMAP_MIN, "value"),
         State(ids.MAPDATA_CMAP_MAX, "value"),
     )
-    def generate_map(n_clicks, value, cmap, reverse, vmin, vmax):
+    def generate_map(n_clicks, signatures_done, value, cmap, reverse, vmin, vmax):
         if n_clicks:
+            # compute missing signatures in the background first, the map is
+            # generated once the computation is done
+            if (
+                value is not None
+                and value.startswith("signature:")
+                and pstore.signatures_pending()
+            ):
+                job_id = pstore.signature_engine.start()
+                return (no_update,) * 7 + (job_id, False)
+
             cmap = cmap + "_r" if reverse else cmap
-            # TODO: join on model names instead of oseries
-            data = get_value_from_pastastore(pstore, value)
-            cmin = data.min().item() if vmin is None else vmin
-            cmax = data.max().item() if vmax is None else vmax
+            data = get_map_data(pstore, value)
+            v = value.split(":")[1]
+            cmin = data[v].min().item() if vmin is None else vmin
+            cmax = data[v].max().item() if vmax is None else vmax
             cmin_input, _, stepmin = derive_input_parameters(cmin, precision=2)
             cmax_input, _, stepmax = derive_input_parameters(cmax, precision=2)
 
-            data = data.join(pstore.oseries).reset_index(
-                drop="name" in pstore.oseries.columns
-            )
+            # only store the value, the data is exported by the server
             return (
                 plot_mapview_results(pstore, data, value, cmap, cmin=cmin, cmax=cmax),
-                data.to_dict("records"),
+                value,
                 False,
                 cmin_input,
                 cmax_input,
                 stepmin,
                 stepmax,
+                no_update,
+                no_update,
             )
         else:
             raise PreventUpdate
 
     @app.callback(
-        Output(ids.DOWNLOAD_MAPDATA, "data"),
-        Input(ids.DOWNLOAD_MAPDATA_BUTTON, "n_clicks"),
-        State(ids.DOWNLOAD_MAP_DATA_STORE, "data"),
-        State(ids.MAP_DROPDOWN_SELECTION, "value"),
+        Output(ids.MAP_SIGNATURE_PROGRESS, "value"),
+        Output(ids.MAP_SIGNATURE_PROGRESS, "label"),
+        Output(ids.MAP_SIGNATURE_PROGRESS_DIV, "style"),
+        Output(ids.MAP_SIGNATURE_CANCEL_BUTTON, "disabled"),
+        Output(ids.MAP_SIGNATURE_INTERVAL, "disabled", allow_duplicate=True),
+        Output(ids.MAP_SIGNATURE_DONE_STORE, "data"),
+        Output(ids.ALERT_MAP_SIGNATURES, "data"),
+        Input(ids.MAP_SIGNATURE_INTERVAL, "n_intervals"),
+        State(ids.MAP_SIGNATURE_JOB_STORE, "data"),
         prevent_initial_call=True,
     )
-    def download_map_data(n_clicks, data, value):
+    def update_signature_progress(n_intervals, job_id):
+        """Show progress of the signature computation.
+
+        Parameters
+        ----------
+        n_intervals : int
+            number of times the interval has passed
+        job_id : str
+            identifier of the signature computation
+
+        Returns
+        -------
+        tuple
+            progress value and label, style of the progress bar, whether the
+            cancel button and interval are disabled, job identifier when the
+            computation is done and alert data.
+        """
+        progress = pstore.signature_engine.progress(job_id)
+        if progress is not None and progress["status"] == "running":
+            done, total = progress["done"], progress["total"]
+            return (
+                100 * done / total if total > 0 else 0,
+                f"Computing signatures: {done}/{total}",
+                {"display": "block"},
+                False,
+                no_update,
+                no_update,
+                no_update,
+            )
+
+        if progress is None:
+            alert = (True, "warning", "Signature computation was interrupted.")
+        elif progress["status"] == "failed":
+            alert = (
+                True,
+                "danger",
+                f"Computing signatures failed: {progress['error']}",
+            )
+        elif progress["status"] == "cancelled":
+            alert = (True, "info", "Computing signatures cancelled.")
+        else:
+            alert = no_update
+        done = job_id if progress is not None and progress["status"] == "done" else None
+        return (
+            0,
+            "",
+            {"display": "none"},
+            True,
+            True,
+            no_update if done is None else done,
+            alert,
+        )
+
+    @app.callback(
+        Output(ids.MAP_SIGNATURE_CANCEL_BUTTON, "disabled", allow_duplicate=True),
+        Input(ids.MAP_SIGNATURE_CANCEL_BUTTON, "n_clicks"),
+        State(ids.MAP_SIGNATURE_JOB_STORE, "data"),
+        prevent_initial_call=True,
+    )
+    def cancel_signature_computation(n_clicks, job_id):
         if n_clicks:
-            value_type, v = value.split(":")
-            timestr = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{timestr}_{value_type}_{v}.csv"
-            if data is not None:
-                return dcc.send_string(pd.DataFrame(data).to_csv, filename=filename)
+            pstore.signature_engine.cancel(job_id)
+            return True
+        else:
+            raise PreventUpdate
+
+    @app.callback(
+        Output(ids.DOWNLOAD_MAPDATA_CSV, "href"),
+        Output(ids.DOWNLOAD_MAPDATA_PARQUET, "href"),
+        Output(ids.DOWNLOAD_MAPDATA_GPKG, "href"),
+        Input(ids.DOWNLOAD_MAP_DATA_STORE, "data"),
+        prevent_initial_call=True,
+    )
+    def set_download_links(value):
+        """Set links for downloading the data shown on the map.
+
+        Parameters
+        ----------
+        value : str
+            value shown on the map
+
+        Returns
+        -------
+        tuple of str
+            links for downloading CSV, Parquet and GeoPackage files
+        """
+        if value is None:
+            raise PreventUpdate
+        query = urlencode({"value": value})
+        return tuple(
+            app.get_relative_path(f"{EXPORT_ROUTE}/{fmt}") + f"?{query}"
+            for fmt in ["csv", "parquet", "gpkg"]
+        )
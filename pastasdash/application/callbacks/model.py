@@ -1,14 +1,12 @@
-import json
-import os
+from functools import partial
 
 import pandas as pd
-import pastas as ps
 from dash import Input, Output, State, no_update
 from dash.exceptions import PreventUpdate
 from pastas.extensions import register_plotly
-from pastas.io.pas import PastasEncoder
 
 from pastasdash.application.components.shared import ids
+from pastasdash.application.datasource.solver import solve_model as solve
 from pastasdash.application.settings import settings
 
 register_plotly()
@@ -17,7 +15,7 @@ register_plotly()
 def register_model_callbacks(app, pstore):
     @app.callback(
         Output(ids.MODEL_RESULTS_CHART, "figure", allow_duplicate=True),
-        Output(ids.MODEL_DIAGNOSTICS_CHART, "figure", allow_duplicate=True),
+        Output(ids.PASTAS_MODEL_STORE, "data", allow_duplicate=True),
         Output(ids.MODEL_SAVE_BUTTON, "disabled", allow_duplicate=True),
         Output(ids.ALERT_PLOT_MODEL_RESULTS, "data"),
         Output(ids.MODEL_DATEPICKER_TMIN, "date"),
@@ -28,7 +26,10 @@ def register_model_callbacks(app, pstore):
         prevent_initial_call=True,
     )
     def plot_model_results(value):
-        """Plot the results and diagnostics of a time series model.
+        """Plot the results of a time series model.
+
+        The diagnostics are plotted separately, see `plot_model_diagnostics`, so
+        the results are shown without waiting for the diagnostics.
 
         Parameters
         ----------
@@ -40,7 +41,7 @@ def register_model_callbacks(app, pstore):
         tuple
             A tuple containing:
             - plotly.graph_objs.Figure: The plotly figure of the model results.
-            - plotly.graph_objs.Figure: The plotly figure of the model diagnostics.
+            - None: Clears the key of the solved model in the staging area.
             - bool: A flag indicating whether to activate model save button.
             - tuple: A tuple containing:
                 - bool: A flag indicating if an alert should be shown.
@@ -58,11 +59,13 @@ def register_model_callbacks(app, pstore):
         """
         if value is not None:
             try:
-                ml = pstore.get_models(value)
+                ml = pstore.get_models(value, copy=False)
                 return (
-                    ml.plotly.results(stderr=settings["SHOW_STDERR"]),
-                    ml.plotly.diagnostics(),
-                    False,
+                    pstore.get_model_figure(
+                        value, "results", stderr=settings["SHOW_STDERR"]
+                    ),
+                    None,
+                    True,
                     (
                         True,  # show alert
                         "success",  # alert color
@@ -76,7 +79,7 @@ def register_model_callbacks(app, pstore):
             except Exception as e:
                 return (
                     {"layout": {"title": "No model"}},
-                    {"layout": {"title": "No model"}},
+                    None,
                     True,
                     (
                         True,  # show alert
@@ -91,7 +94,7 @@ def register_model_callbacks(app, pstore):
         else:
             return (
                 {"layout": {"title": "No model"}},
-                {"layout": {"title": "No model"}},
+                None,
                 True,
                 (
                     False,  # show alert
@@ -105,19 +108,84 @@ def register_model_callbacks(app, pstore):
             )
 
     @app.callback(
-        Output(ids.MODEL_RESULTS_CHART, "figure", allow_duplicate=True),
-        Output(ids.MODEL_DIAGNOSTICS_CHART, "figure", allow_duplicate=True),
-        Output(ids.PASTAS_MODEL_STORE, "data"),
+        Output(ids.MODEL_DIAGNOSTICS_CHART, "figure"),
+        Input(ids.PASTAS_MODEL_STORE, "data"),
+        Input(ids.MODEL_DIAGNOSTICS_SWITCH, "value"),
+        State(ids.MODEL_DROPDOWN_SELECTION, "value"),
+        State(ids.SESSION_ID_STORE, "data"),
+        prevent_initial_call=True,
+    )
+    def plot_model_diagnostics(key, show, value, session_id):
+        """Plot the diagnostics of a time series model.
+
+        Triggered after the results are plotted, when the model is loaded or
+        solved, or when the diagnostics panel is shown. Diagnostics are not
+        computed while the panel is hidden.
+
+        Parameters
+        ----------
+        key : str or None
+            Key of the solved model in the staging area, if None, the diagnostics
+            of the stored model are plotted.
+        show : bool
+            Whether the diagnostics panel is shown.
+        value : str or None
+            The identifier of the selected model.
+        session_id : str
+            Identifier of the browser session.
+
+        Returns
+        -------
+        plotly.graph_objs.Figure or dict
+            The plotly figure of the model diagnostics.
+
+        Raises
+        ------
+        PreventUpdate
+            If the diagnostics panel is hidden.
+        """
+        if not show:
+            raise PreventUpdate
+        try:
+            if key is not None:
+                ml = pstore.staging.get(session_id, key)
+                if ml is not None:
+                    return ml.plotly.diagnostics()
+            elif value is not None:
+                return pstore.get_model_figure(value, "diagnostics")
+        except Exception as e:
+            return {"layout": {"title": f"No diagnostics available: {e}"}}
+        return {"layout": {"title": "No model"}}
+
+    @app.callback(
+        Output(ids.MODEL_RESULTS_COLUMN, "width"),
+        Output(ids.MODEL_DIAGNOSTICS_COLUMN, "style"),
+        Input(ids.MODEL_DIAGNOSTICS_SWITCH, "value"),
+    )
+    def toggle_diagnostics_panel(show):
+        """Show or hide the diagnostics panel, widening the results chart."""
+        if show:
+            return 6, {"display": "block"}
+        return 12, {"display": "none"}
+
+    @app.callback(
+        Output(ids.MODEL_SOLVE_JOB_STORE, "data"),
+        Output(ids.MODEL_SOLVE_INTERVAL, "disabled"),
         Output(ids.MODEL_SAVE_BUTTON, "disabled", allow_duplicate=True),
         Output(ids.ALERT_SOLVE_MODEL, "data"),
         Input(ids.MODEL_SOLVE_BUTTON, "n_clicks"),
         State(ids.MODEL_DROPDOWN_SELECTION, "value"),
         State(ids.MODEL_DATEPICKER_TMIN, "date"),
         State(ids.MODEL_DATEPICKER_TMAX, "date"),
+        State(ids.MODEL_SOLVE_WARM_START, "value"),
+        State(ids.SESSION_ID_STORE, "data"),
         prevent_initial_call=True,
     )
-    def solve_model(n_clicks, value, tmin, tmax):
-        """Generate a time series model based on user input and update the stored copy.
+    def solve_model(n_clicks, value, tmin, tmax, warm_start, session_id):
+        """Submit a job for solving a time series model.
+
+        The model is solved in a worker process, the results are shown once the
+        job is done, see `update_solve_progress`.
 
         Parameters
         ----------
@@ -129,14 +197,18 @@ def register_model_callbacks(app, pstore):
             Minimum timestamp for the model in a format recognized by `pd.Timestamp`.
         tmax : str
             Maximum timestamp for the model in a format recognized by `pd.Timestamp`.
+        warm_start : bool
+            Whether to start solving from the optimal parameters of the stored
+            model.
+        session_id : str
+            Identifier of the browser session submitting the job.
 
         Returns
         -------
         tuple
             A tuple containing:
-            - plotly.graph_objs._figure.Figure: Plotly figure of the model results.
-            - plotly.graph_objs._figure.Figure: Plotly figure of the model diagnostics.
-            - str: JSON representation of the generated model.
+            - str: Identifier of the solve job.
+            - bool: Flag to enable or disable polling of the job status.
             - bool: Flag to enable or disable the save button.
             - tuple: Alert information containing:
                 - bool: Flag to show or hide the alert.
@@ -151,39 +223,21 @@ def register_model_callbacks(app, pstore):
         if n_clicks is not None:
             if value is not None:
                 try:
-                    tmin = pd.Timestamp(tmin)
-                    tmax = pd.Timestamp(tmax)
-
-                    # create model
-                    ml = pstore.get_model(value)
-                    ml.solve(tmin=tmin, tmax=tmax, report=False)
-                    ml.add_noisemodel(ps.ArNoiseModel())
-                    ml.solve(
-                        freq="D",
-                        tmin=tmin,
-                        tmax=tmax,
-                        report=False,
-                        initial=False,
-                    )
-                    # store generated model
-                    mljson = json.dumps(ml.to_dict(), cls=PastasEncoder)
-                    return (
-                        ml.plotly.results(tmin=tmin, tmax=tmax),
-                        ml.plotly.diagnostics(),
-                        mljson,
-                        False,  # enable save button
-                        (
-                            True,  # show alert
-                            "success",  # alert color
-                            f"Created time series model for {value}.",
-                        ),  # empty alert message
+                    ml = pstore.get_models(value)
+                    job_id = pstore.solve_queue.submit(
+                        session_id,
+                        value,
+                        ml,
+                        tmin=pd.Timestamp(tmin),
+                        tmax=pd.Timestamp(tmax),
+                        func=partial(solve, warm_start=bool(warm_start)),
                     )
+                    return job_id, False, True, no_update
                 except Exception as e:
                     return (
                         no_update,
                         no_update,
-                        None,
-                        True,  # disable save button
+                        no_update,
                         (
                             True,  # show alert
                             "danger",  # alert color
@@ -195,21 +249,127 @@ def register_model_callbacks(app, pstore):
         else:
             raise PreventUpdate
 
+    @app.callback(
+        Output(ids.MODEL_RESULTS_CHART, "figure", allow_duplicate=True),
+        Output(ids.PASTAS_MODEL_STORE, "data"),
+        Output(ids.MODEL_SAVE_BUTTON, "disabled", allow_duplicate=True),
+        Output(ids.ALERT_SOLVE_MODEL, "data", allow_duplicate=True),
+        Output(ids.MODEL_SOLVE_INTERVAL, "disabled", allow_duplicate=True),
+        Output(ids.MODEL_SOLVE_PROGRESS, "label"),
+        Output(ids.MODEL_SOLVE_PROGRESS_DIV, "style"),
+        Output(ids.MODEL_SOLVE_CANCEL_BUTTON, "disabled"),
+        Input(ids.MODEL_SOLVE_INTERVAL, "n_intervals"),
+        State(ids.MODEL_SOLVE_JOB_STORE, "data"),
+        State(ids.MODEL_DATEPICKER_TMIN, "date"),
+        State(ids.MODEL_DATEPICKER_TMAX, "date"),
+        State(ids.SESSION_ID_STORE, "data"),
+        prevent_initial_call=True,
+    )
+    def update_solve_progress(n_intervals, job_id, tmin, tmax, session_id):
+        """Show status of the solve job and the results once it is done.
+
+        Parameters
+        ----------
+        n_intervals : int
+            Number of times the status was polled.
+        job_id : str
+            Identifier of the solve job.
+        tmin : str
+            Minimum timestamp for the model in a format recognized by `pd.Timestamp`.
+        tmax : str
+            Maximum timestamp for the model in a format recognized by `pd.Timestamp`.
+        session_id : str
+            Identifier of the browser session that submitted the job.
+
+        Returns
+        -------
+        tuple
+            A tuple containing:
+            - plotly.graph_objs._figure.Figure: Plotly figure of the model results.
+            - str: Key of the solved model in the staging area.
+            - bool: Flag to enable or disable the save button.
+            - tuple: Alert information.
+            - bool: Flag to enable or disable polling of the job status.
+            - str: Progress bar label.
+            - dict: Style of the progress bar.
+            - bool: Flag to enable or disable the cancel button.
+        """
+        status = pstore.solve_queue.status(job_id)
+        if status is not None and status["status"] in ["queued", "running"]:
+            if status["status"] == "queued":
+                label = f"Waiting to solve '{status['name']}' ({status['position']})"
+            else:
+                label = f"Solving '{status['name']}' ({status['elapsed']:.0f} s)"
+            return (no_update,) * 5 + (label, {"display": "block"}, False)
+
+        hidden = ("", {"display": "none"}, True)
+        ml = pstore.solve_queue.pop_result(job_id)
+        if status is None or ml is None:
+            if status is None:
+                message = "Solve job was interrupted."
+            elif status["status"] == "cancelled":
+                message = f"Cancelled solving model for {status['name']}."
+            else:
+                message = f"Error {status['error']}"
+            return (
+                no_update,
+                None,
+                True,  # disable save button
+                (
+                    True,  # show alert
+                    "warning" if status is None else "danger",  # alert color
+                    message,  # alert message
+                ),
+                True,
+            ) + hidden
+
+        tmin = pd.Timestamp(tmin)
+        tmax = pd.Timestamp(tmax)
+        # keep solved model on the server until it is saved
+        key = pstore.staging.put(session_id, ml)
+        return (
+            ml.plotly.results(tmin=tmin, tmax=tmax),
+            key,
+            False,  # enable save button
+            (
+                True,  # show alert
+                "success",  # alert color
+                f"Created time series model for {status['name']}.",
+            ),
+            True,
+        ) + hidden
+
+    @app.callback(
+        Output(ids.MODEL_SOLVE_CANCEL_BUTTON, "disabled", allow_duplicate=True),
+        Input(ids.MODEL_SOLVE_CANCEL_BUTTON, "n_clicks"),
+        State(ids.MODEL_SOLVE_JOB_STORE, "data"),
+        prevent_initial_call=True,
+    )
+    def cancel_solve_model(n_clicks, job_id):
+        if n_clicks:
+            pstore.solve_queue.cancel(job_id)
+            return True
+        else:
+            raise PreventUpdate
+
     @app.callback(
         Output(ids.ALERT_SAVE_MODEL, "data"),
         Input(ids.MODEL_SAVE_BUTTON, "n_clicks"),
         State(ids.PASTAS_MODEL_STORE, "data"),
+        State(ids.SESSION_ID_STORE, "data"),
         prevent_initial_call=True,
     )
-    def save_model(n_clicks, mljson):
-        """Save a model from a JSON string when a button is clicked.
+    def save_model(n_clicks, key, session_id):
+        """Save a solved model from the staging area when a button is clicked.
 
         Parameters
         ----------
         n_clicks : int
             The number of times the save button has been clicked.
-        mljson : str
-            The JSON string representation of the model to be saved.
+        key : str
+            Key of the solved model in the staging area.
+        session_id : str
+            Identifier of the browser session that solved the model.
 
         Returns
         -------
@@ -220,15 +380,18 @@ def register_model_callbacks(app, pstore):
         Raises
         ------
         PreventUpdate
-            If `n_clicks` is None or `mljson` is None.
+            If `n_clicks` is None or `key` is None.
         """
         if n_clicks is None:
             raise PreventUpdate
-        if mljson is not None:
-            with open("temp.pas", "w") as f:
-                f.write(mljson)
-            ml = ps.io.load("temp.pas")
-            os.remove("temp.pas")
+        if key is not None:
+            ml = pstore.staging.get(session_id, key)
+            if ml is None:
+                return (
+                    True,
+                    "warning",
+                    "Solved model is no longer available, solve the model again.",
+                )
             try:
                 pstore.add_model(ml, overwrite=True)
                 return (
@@ -1,8 +1,16 @@
 import numpy as np
 import pandas as pd
 from dash import Input, Output, Patch, State, no_update
+from dash.exceptions import PreventUpdate
 
 from pastasdash.application.components.overview.chart import plot_timeseries
+from pastasdash.application.components.overview.mapview import (
+    get_mapview_selection,
+    get_selected_names,
+    patch_mapview_selection,
+    patch_mapview_viewport,
+    use_clustering,
+)
 from pastasdash.application.components.shared import ids
 from pastasdash.application.settings import settings
 
@@ -28,13 +36,9 @@ def register_overview_callbacks(app, pstore):
         names : list of str
             list of selected names
         """
-        if selected_data is not None:
-            pts = pd.DataFrame(selected_data["points"])
-            if not pts.empty:
-                names = pts["text"].tolist()
-                return names
-            else:
-                return None if current_value is None else current_value
+        names = get_selected_names(pstore, selected_data)
+        if names is not None:
+            return names
         else:
             return None if current_value is None else current_value
 
@@ -109,15 +113,10 @@ def register_overview_callbacks(app, pstore):
 
         # map selection
         if map_selection is not None:
-            pts = pd.DataFrame(map_selection["points"])
-
-            # get selected points
-            if not pts.empty:
-                names = pts["text"].tolist()
-            else:
-                names = None
+            # get selected oseries, ignoring stresses and clusters
+            names = get_selected_names(pstore, map_selection)
 
-            if names is not None and len(names) > settings["SERIES_LOAD_LIMIT"]:
+            if pstore.exceeds_point_limit(names):
                 return (
                     no_update,
                     no_update,
@@ -125,8 +124,10 @@ def register_overview_callbacks(app, pstore):
                         True,
                         "warning",
                         (
-                            "Too many selected points! Maximum no. of "
-                            f"selected points is {settings['SERIES_LOAD_LIMIT']}!"
+                            "Too many observations in selection! Selected time "
+                            f"series contain {pstore.count_observations(names)} "
+                            "observations, maximum no. of observations is "
+                            f"{settings['SERIES_POINT_LIMIT']}!"
                         ),
                     ),
                     (pd.Timestamp.now().isoformat(), False),
@@ -197,10 +198,9 @@ def register_overview_callbacks(app, pstore):
         Output(ids.OVERVIEW_MAP, "figure"),
         Output(ids.OVERVIEW_TABLE_SELECTION_2, "data"),
         Input(ids.OVERVIEW_TABLE, "selected_cells"),
-        State(ids.OVERVIEW_TABLE, "derived_virtual_data"),
         prevent_initial_call=True,
     )
-    def highlight_point_on_map_from_table(table_selection, table):
+    def highlight_point_on_map_from_table(table_selection):
         """Highlights points on a map based on selected cells from overview table.
 
         Parameters
@@ -209,8 +209,6 @@ def register_overview_callbacks(app, pstore):
             List of dictionaries containing information about selected cells.
             Each dictionary should have a "row" key. If None, the function returns
             no updates.
-        table : dict
-            records representing the table data.
 
         Returns
         -------
@@ -224,36 +222,92 @@ def register_overview_callbacks(app, pstore):
         if table_selection is None:
             return no_update, no_update, (pd.Timestamp.now().isoformat(), False)
 
-        rows = np.unique([cell["row_id"] for cell in table_selection]).tolist()
-        df = pd.DataFrame.from_dict(table, orient="columns").set_index("id")
-        loc = df.loc[rows]
-        pts = loc.index.tolist()
+        pts = np.unique([cell["row_id"] for cell in table_selection]).tolist()
 
-        dfm = (
-            pstore.oseries.reset_index(drop=("name" in pstore.oseries.columns))
-            .set_index("id")
-            .loc[pts]
-        )
-        dfm["curveNumber"] = 0
-        # update selected points
-        mappatch = Patch()
-        mappatch["data"][0]["selectedpoints"] = dfm.index.tolist()
+        # update selected points, if points are clustered, zoom to selection so
+        # the selected points are shown
+        if use_clustering(pstore):
+            mappatch = patch_mapview_selection(pstore, pts)
+        else:
+            mappatch = Patch()
+            mappatch["data"][0]["selectedpoints"] = pts
 
-        selectedData = {
-            "points": [
-                {
-                    "curveNumber": dfm.at[i, "curveNumber"],
-                    "pointNumber": i,
-                    "pointIndex": i,
-                    "lon": dfm.at[i, "lon"],
-                    "lat": dfm.at[i, "lat"],
-                    "text": dfm.at[i, "name"],
-                }
-                for i in pts
-            ]
-        }
+        selectedData = get_mapview_selection(pstore, pts)
         return (
             selectedData,
             mappatch,
             (pd.Timestamp.now().isoformat(), True),
         )
+
+    @app.callback(
+        Output(ids.OVERVIEW_MAP, "figure", allow_duplicate=True),
+        Input(ids.OVERVIEW_MAP, "relayoutData"),
+        State(ids.SELECTED_OSERIES_STORE, "data"),
+        prevent_initial_call=True,
+    )
+    def update_map_viewport(relayout_data, selected_oseries):
+        """Update points and clusters in view when map is moved or zoomed.
+
+        Only applies if map points are clustered, otherwise all points are drawn.
+
+        Parameters
+        ----------
+        relayout_data : dict
+            relayout data of the map
+        selected_oseries : list of str
+            names of the selected oseries
+
+        Returns
+        -------
+        Patch
+            patch updating the points and clusters in the map
+        """
+        patch = patch_mapview_viewport(pstore, selected_oseries, relayout_data)
+        if patch is None:
+            raise PreventUpdate
+        return patch
+
+    @app.callback(
+        Output(ids.SERIES_CHART, "figure", allow_duplicate=True),
+        Input(ids.SERIES_CHART, "relayoutData"),
+        State(ids.SELECTED_OSERIES_STORE, "data"),
+        prevent_initial_call=True,
+    )
+    def update_time_series_window(relayout_data, selected_oseries):
+        """Reload time series for the visible window of the time series chart.
+
+        Time series are downsampled for plotting. When the user zooms or pans, the
+        time series are reloaded for the visible window only, so that more detail
+        is shown when zooming in.
+
+        Parameters
+        ----------
+        relayout_data : dict
+            relayout data of the time series chart
+        selected_oseries : list of str
+            names of the plotted time series
+
+        Returns
+        -------
+        Patch
+            patch replacing the traces and annotations in the time series chart
+        """
+        if relayout_data is None or selected_oseries is None:
+            raise PreventUpdate
+        if "xaxis.range[0]" in relayout_data:
+            tmin = pd.Timestamp(relayout_data["xaxis.range[0]"])
+            tmax = pd.Timestamp(relayout_data["xaxis.range[1]"])
+        elif "xaxis.range" in relayout_data:
+            tmin, tmax = map(pd.Timestamp, relayout_data["xaxis.range"])
+        elif relayout_data.get("xaxis.autorange", False):
+            tmin, tmax = None, None
+        else:
+            raise PreventUpdate
+
+        chart = plot_timeseries(pstore, selected_oseries, tmin=tmin, tmax=tmax)
+        if chart is None:
+            raise PreventUpdate
+        patch = Patch()
+        patch["data"] = chart["data"]
+        patch["layout"]["annotations"] = chart["layout"].get("annotations", [])
+        return patch
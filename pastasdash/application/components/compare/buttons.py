@@ -1,5 +1,5 @@
 import dash_bootstrap_components as dbc
-from dash import html
+from dash import dcc, html
 
 from pastasdash.application.components.shared import ids
 
@@ -58,3 +58,103 @@ def render_deselect_all_in_table_button():
             id=ids.COMPARE_TABLE_DESELECT_ALL_BUTTON,
         ),
     )
+
+
+def render_batch_solve_button():
+    """Renders a button for solving the models of the selected wells.
+
+    Returns
+    -------
+    html.Div
+        A Dash HTML Div containing the button.
+    """
+    return html.Div(
+        [
+            dbc.Button(
+                html.Span(
+                    [
+                        html.I(className="fa-solid fa-gears"),
+                        " " + "Solve selected",
+                    ],
+                    id="span-batch-solve",
+                    n_clicks=0,
+                ),
+                style={
+                    "margin-top": 10,
+                    "margin-bottom": 10,
+                },
+                disabled=False,
+                id=ids.COMPARE_BATCH_SOLVE_BUTTON,
+            ),
+            dbc.Tooltip(
+                html.P(
+                    (
+                        "Recalibrate all models of the selected observation wells "
+                        "and overwrite the stored models."
+                    ),
+                    style={"margin-bottom": 0},
+                ),
+                target=ids.COMPARE_BATCH_SOLVE_BUTTON,
+                placement="right",
+            ),
+        ]
+    )
+
+
+def render_batch_solve_progress():
+    """Renders a progress bar and cancel button for solving a batch of models.
+
+    Hidden until models are being solved. Progress is polled using an interval
+    component, which is only enabled while solving.
+
+    Returns
+    -------
+    html.Div
+        A Div containing the progress bar, cancel button, interval and store.
+    """
+    return html.Div(
+        [
+            dbc.Row(
+                [
+                    dbc.Col(
+                        dbc.Progress(
+                            id=ids.COMPARE_BATCH_SOLVE_PROGRESS,
+                            value=0,
+                            label="",
+                            striped=True,
+                            animated=True,
+                            style={"height": 20},
+                        ),
+                        style={"align-self": "center"},
+                    ),
+                    dbc.Col(
+                        dbc.Button(
+                            html.Span(
+                                [
+                                    html.I(className="fa-regular fa-circle-stop"),
+                                    " Cancel",
+                                ],
+                                id="span-cancel-batch-solve",
+                                n_clicks=0,
+                            ),
+                            style={
+                                "margin-top": 5,
+                                "margin-bottom": 5,
+                            },
+                            disabled=True,
+                            id=ids.COMPARE_BATCH_SOLVE_CANCEL_BUTTON,
+                        ),
+                        width="auto",
+                    ),
+                ]
+            ),
+            dcc.Interval(
+                id=ids.COMPARE_BATCH_SOLVE_INTERVAL,
+                interval=1000,
+                disabled=True,
+            ),
+            dcc.Store(id=ids.COMPARE_BATCH_SOLVE_JOB_STORE),
+        ],
+        id=ids.COMPARE_BATCH_SOLVE_PROGRESS_DIV,
+        style={"display": "none"},
+    )
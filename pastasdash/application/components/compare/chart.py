@@ -4,6 +4,7 @@ import plotly.graph_objs as go
 from dash import dcc, html
 
 from pastasdash.application.components.shared import ids
+from pastasdash.application.utils import encode_array
 
 
 def render():
@@ -31,7 +32,34 @@ def render():
     )
 
 
-def plot_model_comparison(mllist, tmin=None, tmax=None):
+def get_rsq_from_simulation(obs, sim):
+    """Compute R-squared from observations and a (cached) simulation.
+
+    The simulation is interpolated to the observation times, like in
+    pastas.Model.residuals().
+
+    Parameters
+    ----------
+    obs : pandas.Series
+        observations used for calibration
+    sim : pandas.Series
+        simulated heads
+
+    Returns
+    -------
+    float
+        R-squared
+    """
+    sim_obs = (
+        sim.reindex(sim.index.union(obs.index))
+        .interpolate(method="time")
+        .loc[obs.index]
+    )
+    mask = sim_obs.notna()
+    return ps.stats.metrics.rsq(obs=obs.loc[mask], sim=sim_obs.loc[mask])
+
+
+def plot_model_comparison(mllist, tmin=None, tmax=None, pstore=None):
     """Plotly version of pastas.Model.plot().
 
     Parameters
@@ -42,6 +70,9 @@ def plot_model_comparison(mllist, tmin=None, tmax=None):
         start time for model simulation, by default None
     tmax : pd.Timestamp, optional
         end time for model simulation, by default None
+    pstore : PastaStoreInterface, optional
+        if provided, simulations of stored models are read concurrently from the
+        simulation cache instead of being recomputed, by default None
 
     Returns
     -------
@@ -55,6 +86,9 @@ def plot_model_comparison(mllist, tmin=None, tmax=None):
     if isinstance(mllist, ps.Model):
         mllist = [mllist]
 
+    if pstore is not None:
+        sims = pstore.get_simulations([ml.name for ml in mllist], tmin=tmin, tmax=tmax)
+
     for i, ml in enumerate(mllist):
         color = colors[i % len(colors)]
 
@@ -64,8 +98,8 @@ def plot_model_comparison(mllist, tmin=None, tmax=None):
         # add oseries
         if not o_nu.empty:
             trace_oseries_nu = go.Scattergl(
-                x=o_nu.index,
-                y=o_nu.values,
+                x=encode_array(o_nu.index),
+                y=encode_array(o_nu.values),
                 mode="markers",
                 marker={"color": "gray", "size": 3},
                 name="(unused)",
@@ -73,8 +107,8 @@ def plot_model_comparison(mllist, tmin=None, tmax=None):
                 showlegend=False,
             )
             trace_oseries = go.Scattergl(
-                x=o.index,
-                y=o.values,
+                x=encode_array(o.index),
+                y=encode_array(o.values),
                 mode="markers",
                 marker={
                     "line": {"color": "black", "width": 1.0},
@@ -88,8 +122,8 @@ def plot_model_comparison(mllist, tmin=None, tmax=None):
             traces.append(trace_oseries)
         else:
             trace_oseries = go.Scattergl(
-                x=o.index,
-                y=o.values,
+                x=encode_array(o.index),
+                y=encode_array(o.values),
                 mode="markers",
                 marker={"line": {"color": "black", "width": 1.0}, "color": color},
                 name=ml.oseries.name,
@@ -97,20 +131,26 @@ def plot_model_comparison(mllist, tmin=None, tmax=None):
             )
             traces.append(trace_oseries)
 
-        sim = ml.simulate(tmin=tmin, tmax=tmax)
+        if pstore is None:
+            sim = ml.simulate(tmin=tmin, tmax=tmax)
+            rsq = ml.stats.rsq()
+        else:
+            sim = sims[i]["simulation"]
+            rsq = get_rsq_from_simulation(o, sim)
         trace_sim = go.Scattergl(
-            x=sim.index,
-            y=sim.values,
+            x=encode_array(sim.index),
+            y=encode_array(sim.values),
             mode="lines",
             # marker_color="#1F77B4",
             marker={"color": color},
-            name=f"Sim (R<sup>2</sup> = {ml.stats.rsq():.3f})",
+            name=f"Sim (R<sup>2</sup> = {rsq:.3f})",
             legendgroup=ml.name,
         )
         traces.append(trace_sim)
 
         layout = {
             # "xaxis": {"range": [sim.index[0], sim.index[-1]]},
+            "xaxis": {"type": "date"},
             "yaxis": {"title": "(m NAP)"},
             "legend": {
                 "traceorder": "reversed+grouped",
@@ -2,7 +2,10 @@ from dash import dash_table, html
 from dash.dash_table.Format import Format
 
 from pastasdash.application.components.shared import ids
-from pastasdash.application.components.shared.styling import DATA_TABLE_HEADER_BGCOLOR
+from pastasdash.application.components.shared.styling import (
+    DATA_TABLE_FALSE_BGCOLOR,
+    DATA_TABLE_HEADER_BGCOLOR,
+)
 from pastasdash.application.datasource import PastaStoreInterface
 
 
@@ -201,3 +204,47 @@ def render_modelchecks_table():
         ),
         style={"margin-top": "1vh"},
     )
+
+
+def render_batch_solve_table():
+    return html.Div(
+        dash_table.DataTable(
+            id=ids.COMPARE_BATCH_SOLVE_TABLE,
+            columns=[
+                {"id": "name", "name": "Model", "type": "text"},
+                {"id": "status", "name": "Status", "type": "text"},
+                {
+                    "id": "time",
+                    "name": "Time (s)",
+                    "type": "numeric",
+                    "format": {"specifier": ".2f"},
+                },
+                {"id": "error", "name": "Error", "type": "text"},
+            ],
+            data=[],
+            sort_action="native",
+            style_cell={"whiteSpace": "pre-line", "fontSize": 10},
+            style_cell_conditional=[
+                {
+                    "if": {"column_id": c},
+                    "textAlign": "left",
+                }
+                for c in ["name", "status", "error"]
+            ],
+            style_data_conditional=[
+                {
+                    "if": {"filter_query": '{status} = "failed"'},
+                    "backgroundColor": DATA_TABLE_FALSE_BGCOLOR,
+                },
+            ],
+            style_header={
+                "backgroundColor": DATA_TABLE_HEADER_BGCOLOR,
+                "fontWeight": "bold",
+            },
+            style_table={
+                "maxHeight": "25vh",
+                "overflowY": "auto",
+            },
+        ),
+        style={"margin-top": "1vh"},
+    )
@@ -66,8 +66,14 @@ def render_content(pstore: PastaStoreInterface, selected_data: str):
                                         [buttons.render_deselect_all_in_table_button()],
                                         width="auto",
                                     ),
+                                    dbc.Col(
+                                        [buttons.render_batch_solve_button()],
+                                        width="auto",
+                                    ),
                                 ],
                             ),
+                            buttons.render_batch_solve_progress(),
+                            datatable.render_batch_solve_table(),
                         ],
                         class_name="col-right-border",
                         width=4,
@@ -28,6 +28,7 @@ def create_layout(app: Dash, pstore: PastaStoreInterface) -> html.Div:
             dcc.Store(id=ids.PASTAS_MODEL_STORE),
             dcc.Store(id=ids.DOWNLOAD_MAP_DATA_STORE),
             dcc.Store(id=ids.PASTASTORE_CONFIG_FILE_STORE),
+            dcc.Store(id=ids.SESSION_ID_STORE, storage_type="session"),
             # avoiding duplicate callback stores
             dcc.Store(id=ids.OVERVIEW_TABLE_SELECTION_1),
             dcc.Store(id=ids.OVERVIEW_TABLE_SELECTION_2),
@@ -37,6 +38,8 @@ def create_layout(app: Dash, pstore: PastaStoreInterface) -> html.Div:
             dcc.Store(id=ids.ALERT_PLOT_MODEL_RESULTS),
             dcc.Store(id=ids.ALERT_SOLVE_MODEL),
             dcc.Store(id=ids.ALERT_SAVE_MODEL),
+            dcc.Store(id=ids.ALERT_MAP_SIGNATURES),
+            dcc.Store(id=ids.ALERT_BATCH_SOLVE),
             # header + tabs
             html.Div(
                 id="header",
@@ -1,5 +1,13 @@
 from dash import dcc, html
-from dash_bootstrap_components import Button, Tooltip
+from dash_bootstrap_components import (
+    Button,
+    Col,
+    DropdownMenu,
+    DropdownMenuItem,
+    Progress,
+    Row,
+    Tooltip,
+)
 
 from pastasdash.application.components.shared import ids
 
@@ -49,25 +57,44 @@ def render_map_button():
     )
 
 
-def render_download_mapdata_as_csv_button():
-    """Renders a button for generating time series models.
+def render_download_mapdata_button():
+    """Renders a dropdown menu for downloading the map data.
+
+    The links to the files are set once a map is generated, the files are
+    exported by the server.
 
     Returns
     -------
     html.Div
-        A Div containing the generate model button.
+        A Div containing the download dropdown menu.
     """
     return html.Div(
         [
-            Button(
-                html.Span(
+            DropdownMenu(
+                label=html.Span(
                     [
-                        html.I(className="fa-solid fa-file-csv"),
+                        html.I(className="fa-solid fa-download"),
                         " " + "Download data",
                     ],
-                    id="span-render-download-csv",
-                    n_clicks=0,
+                    id="span-render-download-data",
                 ),
+                children=[
+                    DropdownMenuItem(
+                        "CSV",
+                        id=ids.DOWNLOAD_MAPDATA_CSV,
+                        external_link=True,
+                    ),
+                    DropdownMenuItem(
+                        "Parquet",
+                        id=ids.DOWNLOAD_MAPDATA_PARQUET,
+                        external_link=True,
+                    ),
+                    DropdownMenuItem(
+                        "GeoPackage",
+                        id=ids.DOWNLOAD_MAPDATA_GPKG,
+                        external_link=True,
+                    ),
+                ],
                 style={
                     "margin-top": 5,
                     "margin-bottom": 5,
@@ -78,13 +105,75 @@ def render_download_mapdata_as_csv_button():
             Tooltip(
                 children=[
                     html.P(
-                        ("Download the data shown on the map as a CSV file."),
+                        (
+                            "Download the data shown on the map as a CSV, "
+                            "Parquet or GeoPackage file."
+                        ),
                         style={"margin-bottom": 0},
                     ),
                 ],
                 target=ids.DOWNLOAD_MAPDATA_BUTTON,
                 placement="right",
             ),
-            dcc.Download(id=ids.DOWNLOAD_MAPDATA),
         ]
     )
+
+
+def render_signature_progress():
+    """Renders a progress bar and cancel button for computing signatures.
+
+    Hidden until signatures are being computed. Progress is polled using an
+    interval component, which is only enabled while computing.
+
+    Returns
+    -------
+    html.Div
+        A Div containing the progress bar, cancel button, interval and stores.
+    """
+    return html.Div(
+        [
+            Row(
+                [
+                    Col(
+                        Progress(
+                            id=ids.MAP_SIGNATURE_PROGRESS,
+                            value=0,
+                            label="",
+                            striped=True,
+                            animated=True,
+                            style={"height": 20},
+                        ),
+                        style={"align-self": "center"},
+                    ),
+                    Col(
+                        Button(
+                            html.Span(
+                                [
+                                    html.I(className="fa-regular fa-circle-stop"),
+                                    " Cancel",
+                                ],
+                                id="span-cancel-signatures-button",
+                                n_clicks=0,
+                            ),
+                            style={
+                                "margin-top": 5,
+                                "margin-bottom": 5,
+                            },
+                            disabled=True,
+                            id=ids.MAP_SIGNATURE_CANCEL_BUTTON,
+                        ),
+                        width="auto",
+                    ),
+                ]
+            ),
+            dcc.Interval(
+                id=ids.MAP_SIGNATURE_INTERVAL,
+                interval=500,
+                disabled=True,
+            ),
+            dcc.Store(id=ids.MAP_SIGNATURE_JOB_STORE),
+            dcc.Store(id=ids.MAP_SIGNATURE_DONE_STORE),
+        ],
+        id=ids.MAP_SIGNATURE_PROGRESS_DIV,
+        style={"display": "none"},
+    )
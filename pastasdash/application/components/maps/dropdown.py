@@ -1,9 +1,8 @@
 import pastas as ps
-import plotly.express as px
 from dash import dcc, html
 
 from pastasdash.application.components.shared import ids
-from pastasdash.application.components.shared.styling import get_colormap_figures
+from pastasdash.application.components.shared.styling import get_colormap_swatches
 
 
 def render_value_dropdown(pstore):
@@ -68,20 +67,11 @@ def render_value_dropdown(pstore):
 
 
 def render_colormap_dropdown():
-    options = (
-        [
-            {"label": fig, "value": name}
-            for name, fig in get_colormap_figures(px.colors.sequential).items()
-        ]
-        + [
-            {"label": fig, "value": name}
-            for name, fig in get_colormap_figures(px.colors.diverging).items()
-        ]
-        + [
-            {"label": fig, "value": name}
-            for name, fig in get_colormap_figures(px.colors.cyclical).items()
-        ]
-    )
+    options = [
+        {"label": swatch, "value": name, "search": name}
+        for source in ["sequential", "diverging", "cyclical"]
+        for name, swatch in get_colormap_swatches(source).items()
+    ]
 
     return html.Div(
         [
@@ -1,6 +1,4 @@
-import functools
-
-import pandas as pd
+import pastas as ps
 import plotly.express as px
 import plotly.graph_objs as go
 from dash import dcc, html
@@ -10,8 +8,8 @@ from pastasdash.application.components.shared import ids
 from pastasdash.application.datasource import PastaStoreInterface
 from pastasdash.application.settings import settings
 from pastasdash.application.utils import (
-    add_latlon_to_dataframe,
     conditional_decorator,
+    encode_array,
     get_plotting_zoom_level_and_center_coordinates,
 )
 
@@ -49,24 +47,87 @@ def render(
     )
 
 
-@functools.lru_cache
-def get_value_from_pastastore(pstore, value):
+def parse_value(pstore, value):
+    """Split value into its type and name and check that the value is known.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    value : str
+        value as "<type>:<name>", e.g. "metric:rmse"
+
+    Returns
+    -------
+    tuple of str
+        type of the value in lowercase and name of the value
+
+    Raises
+    ------
+    ValueError
+        If the value is not a known parameter, metric or signature.
+    """
     value_type, v = value.split(":")
-    if value_type.lower() == "parameter":
-        data = pstore.get_parameters([v], progressbar=True)
-    elif value_type.lower() == "metric":
-        data = pstore.get_statistics(
-            [v], parallel=settings["PARALLEL"], progressbar=True
-        )
-    elif value_type.lower() == "signature":
-        data = pstore.get_signatures([v], progressbar=True)
-    else:
+    value_type = value_type.lower()
+    known = {
+        "parameter": pstore.unique_parameters,
+        "metric": ps.modelstats.Statistics.ops,
+        "signature": ps.stats.signatures.__all__,
+    }
+    if value_type not in known or v not in known[value_type]:
         raise ValueError(f"Unknown value: {value_type}: {v}")
+    return value_type, v
+
+
+def get_value_from_pastastore(pstore, value):
+    """Get parameter, metric or signature for all models.
+
+    Values are read from the persistent results matrix, so only models that
+    changed since the last call are recomputed.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    value : str
+        name of the value, "<type>:<name>", e.g. "metric:rsq"
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame indexed by model name, with the value in a column named after
+        the value name without the type
+
+    Raises
+    ------
+    ValueError
+        If the value is not a known parameter, metric or signature.
+    """
+    value_type, v = parse_value(pstore, value)
+    data = pstore.get_model_result(f"{value_type}:{v}").to_frame(v)
     data.index.name = "name"
-    if isinstance(data, pd.Series):
-        return data.to_frame()
-    else:
-        return data
+    return data
+
+
+def get_map_data(pstore, value):
+    """Get value for all models, joined with the oseries metadata.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    value : str
+        name of the value, "<type>:<name>", e.g. "metric:rsq"
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with the value in a column named after the value name without
+        the type, and the oseries metadata.
+    """
+    # TODO: join on model names instead of oseries
+    data = get_value_from_pastastore(pstore, value)
+    return data.join(pstore.oseries).reset_index(drop="name" in pstore.oseries.columns)
 
 
 def plot_mapview_results(pstore, data, value: str, cmap: str, cmin=None, cmax=None):
@@ -92,7 +153,7 @@ def plot_mapview_results(pstore, data, value: str, cmap: str, cmin=None, cmax=No
         }
         return {"data": [{"type": "scattermap"}], "layout": maplayout}
 
-    oseries = add_latlon_to_dataframe(pstore.oseries)
+    oseries = pstore.oseries
 
     zoom, center = get_plotting_zoom_level_and_center_coordinates(
         oseries.lon.values, oseries.lat.values
@@ -134,9 +195,7 @@ def plot_mapview_results(pstore, data, value: str, cmap: str, cmin=None, cmax=No
     }
 
     # stresses data for map
-    stresses = add_latlon_to_dataframe(
-        pstore.stresses.reset_index(drop=("name" in pstore.stresses.columns))
-    )
+    stresses = pstore.stresses.reset_index(drop=("name" in pstore.stresses.columns))
     kind_dict = {}
     for i, k in enumerate(stresses.kind.unique()):
         kind_dict[k] = px.colors.qualitative.G10[i]
@@ -145,8 +204,8 @@ def plot_mapview_results(pstore, data, value: str, cmap: str, cmin=None, cmax=No
     for kind, sdf in stresses.groupby("kind"):
         stresses_data.append(
             {
-                "lat": sdf["lat"],
-                "lon": sdf["lon"],
+                "lat": encode_array(sdf["lat"]),
+                "lon": encode_array(sdf["lon"]),
                 "name": kind,
                 "type": "scattermap",
                 "text": sdf["name"].tolist(),
@@ -202,22 +261,22 @@ def plot_mapview_results(pstore, data, value: str, cmap: str, cmin=None, cmax=No
     mask = mdata[v].isna()
     if not mask.all():
         map_data = {
-            "lat": mdata.loc[~mask, "lat"],
-            "lon": mdata.loc[~mask, "lon"],
+            "lat": encode_array(mdata.loc[~mask, "lat"]),
+            "lon": encode_array(mdata.loc[~mask, "lon"]),
             "name": "Models",
-            "customdata": mdata.loc[~mask, "z"],
+            "customdata": encode_array(mdata.loc[~mask, "z"]),
             "type": "scattermap",
             "text": mdata.loc[~mask, "name"].tolist(),
             "textposition": "top center",
             "textfont": {"size": 12, "color": "black"},
             "mode": "markers",
             "marker": go.scattermap.Marker(
-                size=msize,
+                size=encode_array(msize),
                 opacity=0.7,
                 sizeref=0.5,
                 sizemin=2,
                 sizemode="area",
-                color=mdata.loc[~mask, v],
+                color=encode_array(mdata.loc[~mask, v]),
                 colorscale=cmap.lower(),
                 cmin=cmin,
                 cmax=cmax,
@@ -250,17 +309,17 @@ def plot_mapview_results(pstore, data, value: str, cmap: str, cmin=None, cmax=No
 
     if mask.any():
         map_nodata = {
-            "lat": mdata.loc[mask, "lat"],
-            "lon": mdata.loc[mask, "lon"],
+            "lat": encode_array(mdata.loc[mask, "lat"]),
+            "lon": encode_array(mdata.loc[mask, "lon"]),
             "name": "Models",
-            "customdata": mdata.loc[mask, "z"],
+            "customdata": encode_array(mdata.loc[mask, "z"]),
             "type": "scattermap",
             "text": mdata.loc[mask, "name"].tolist(),
             "textposition": "top center",
             "textfont": {"size": 12, "color": "black"},
             "mode": "markers",
             "marker": go.scattermap.Marker(
-                size=msize,
+                size=encode_array(msize),
                 opacity=0.7,
                 sizeref=0.5,
                 sizemin=2,
@@ -108,11 +108,12 @@ def render_content(pstore: PastaStoreInterface):
                         width="auto",
                     ),
                     dbc.Col([button.render_map_button()], width="auto"),
-                    dbc.Col(
-                        [button.render_download_mapdata_as_csv_button()], width="auto"
-                    ),
+                    dbc.Col([button.render_download_mapdata_button()], width="auto"),
                 ]
             ),
+            dbc.Row(
+                children=[dbc.Col(button.render_signature_progress(), width=12)],
+            ),
             dbc.Row(
                 children=[dbc.Col(mapview.render(pstore), width=12)],
                 # style={"height": "75vh"},
@@ -1,7 +1,8 @@
-from dash import html
-from dash_bootstrap_components import Button, Tooltip
+from dash import dcc, html
+from dash_bootstrap_components import Button, Col, Progress, Row, Switch, Tooltip
 
 from pastasdash.application.components.shared import ids
+from pastasdash.application.settings import settings
 
 
 def render_solve_button():
@@ -44,6 +45,72 @@ def render_solve_button():
     )
 
 
+def render_warm_start_switch():
+    """Renders a switch for solving models starting from the stored optimum.
+
+    Returns
+    -------
+    html.Div
+        A Div containing the warm start switch.
+    """
+    return html.Div(
+        [
+            Switch(
+                id=ids.MODEL_SOLVE_WARM_START,
+                label="Warm start",
+                value=settings["SOLVE_WARM_START"],
+                style={"margin-top": 16, "margin-bottom": 10},
+            ),
+            Tooltip(
+                children=[
+                    html.P(
+                        "Start from the optimal parameters of the stored model and "
+                        "solve once with the noise model. Only used if the model "
+                        "was solved before with a noise model.",
+                        style={"margin-bottom": 0},
+                    ),
+                ],
+                target=ids.MODEL_SOLVE_WARM_START,
+                placement="right",
+            ),
+        ]
+    )
+
+
+def render_diagnostics_switch():
+    """Renders a switch for showing the model diagnostics panel.
+
+    Diagnostics are only computed while the panel is shown.
+
+    Returns
+    -------
+    html.Div
+        A Div containing the diagnostics switch.
+    """
+    return html.Div(
+        [
+            Switch(
+                id=ids.MODEL_DIAGNOSTICS_SWITCH,
+                label="Diagnostics",
+                value=True,
+                persistence=True,
+                persistence_type="session",
+                style={"margin-top": 16, "margin-bottom": 10},
+            ),
+            Tooltip(
+                children=[
+                    html.P(
+                        "Show model diagnostics plot. Hide it to load models faster.",
+                        style={"margin-bottom": 0},
+                    ),
+                ],
+                target=ids.MODEL_DIAGNOSTICS_SWITCH,
+                placement="right",
+            ),
+        ]
+    )
+
+
 def render_save_button():
     """Renders a save model button component.
 
@@ -82,3 +149,62 @@ def render_save_button():
             ),
         ]
     )
+
+
+def render_solve_progress():
+    """Renders a progress bar and cancel button for solving a model.
+
+    Hidden until a model is being solved. The status of the solve job is polled
+    using an interval component, which is only enabled while solving.
+
+    Returns
+    -------
+    html.Div
+        A Div containing the progress bar, cancel button, interval and store.
+    """
+    return html.Div(
+        [
+            Row(
+                [
+                    Col(
+                        Progress(
+                            id=ids.MODEL_SOLVE_PROGRESS,
+                            value=100,
+                            label="",
+                            striped=True,
+                            animated=True,
+                            style={"height": 20},
+                        ),
+                        style={"align-self": "center"},
+                    ),
+                    Col(
+                        Button(
+                            html.Span(
+                                [
+                                    html.I(className="fa-regular fa-circle-stop"),
+                                    " Cancel",
+                                ],
+                                id="span-cancel-solve-button",
+                                n_clicks=0,
+                            ),
+                            style={
+                                "margin-top": 5,
+                                "margin-bottom": 5,
+                            },
+                            disabled=True,
+                            id=ids.MODEL_SOLVE_CANCEL_BUTTON,
+                        ),
+                        width="auto",
+                    ),
+                ]
+            ),
+            dcc.Interval(
+                id=ids.MODEL_SOLVE_INTERVAL,
+                interval=1000,
+                disabled=True,
+            ),
+            dcc.Store(id=ids.MODEL_SOLVE_JOB_STORE),
+        ],
+        id=ids.MODEL_SOLVE_PROGRESS_DIV,
+        style={"display": "none"},
+    )
@@ -14,8 +14,8 @@ def render_datepicker_tmin(pstore: PastaStoreInterface, selected_data):
     selected_data : list or None
         A list containing the selected data. If the list contains exactly one
         item, the function will attempt to retrieve the tmin date for that
-        item. If None or the list length is not 1, the date picker will be
-        disabled.
+        item from the time series statistics index. If None or the list length
+        is not 1, the date picker will be disabled.
 
     Returns
     -------
@@ -25,7 +25,7 @@ def render_datepicker_tmin(pstore: PastaStoreInterface, selected_data):
     if selected_data is not None and len(selected_data) == 1:
         name = selected_data[0]
         try:
-            tmintmax = pstore.get_tmin_tmax("oseries", name)
+            tmintmax = pstore.oseries_stats([name])
             start_date = tmintmax.loc[name, "tmin"].to_pydatetime()
             disabled = False
         except Exception:
@@ -53,14 +53,13 @@ def render_datepicker_tmax(pstore, selected_data):
 
     Parameters
     ----------
-    data : object
-        The data object containing the `pstore` attribute, which provides
-        access to the `get_tmin_tmax` method.
+    pstore : PastaStoreInterface
+        The database interface object.
     selected_data : list or None
         A list containing the selected data. If the list contains exactly one
         item, the function will attempt to retrieve the tmax date for that
-        item. If None or the list length is not 1, the date picker will be
-        disabled.
+        item from the time series statistics index. If None or the list length
+        is not 1, the date picker will be disabled.
 
     Returns
     -------
@@ -70,7 +69,7 @@ def render_datepicker_tmax(pstore, selected_data):
     if selected_data is not None and len(selected_data) == 1:
         name = selected_data[0]
         try:
-            tmintmax = pstore.get_tmin_tmax("oseries", name)
+            tmintmax = pstore.oseries_stats([name])
             end_date = tmintmax.loc[name, "tmax"].to_pydatetime()
             disabled = False
         except Exception:
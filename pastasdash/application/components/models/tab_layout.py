@@ -58,9 +58,14 @@ def render_content(pstore: PastaStoreInterface, selected_data: List):
                         width="auto",
                     ),
                     dbc.Col([button.render_solve_button()], width="auto"),
+                    dbc.Col([button.render_warm_start_switch()], width="auto"),
                     dbc.Col([button.render_save_button()], width="auto"),
+                    dbc.Col([button.render_diagnostics_switch()], width="auto"),
                 ],
             ),
+            dbc.Row(
+                children=[dbc.Col(button.render_solve_progress(), width=12)],
+            ),
             dbc.Row(
                 [
                     # Column 1: Model results plot
@@ -69,6 +74,7 @@ def render_content(pstore: PastaStoreInterface, selected_data: List):
                             plots.render_results(),
                         ],
                         width=6,
+                        id=ids.MODEL_RESULTS_COLUMN,
                     ),
                     # Column 2: Model diagnostics plot
                     dbc.Col(
@@ -76,6 +82,7 @@ def render_content(pstore: PastaStoreInterface, selected_data: List):
                             plots.render_diagnostics(),
                         ],
                         width=6,
+                        id=ids.MODEL_DIAGNOSTICS_COLUMN,
                     ),
                 ]
             ),
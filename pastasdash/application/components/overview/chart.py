@@ -1,10 +1,17 @@
 import dash_bootstrap_components as dbc
+import pandas as pd
 import plotly.graph_objs as go
 from dash import __version__ as DASH_VERSION
 from dash import dcc, html
 from packaging.version import parse as parse_version
 
 from pastasdash.application.components.shared import ids
+from pastasdash.application.settings import settings
+from pastasdash.application.utils import (
+    allocate_point_budget,
+    downsample_timeseries,
+    encode_array,
+)
 
 
 def render_cancel_button():
@@ -76,7 +83,7 @@ def render(pstore, selected_data):
     )
 
 
-def plot_timeseries(pstore, names):
+def plot_timeseries(pstore, names, tmin=None, tmax=None):
     """Plots observation data for given names.
 
     Parameters
@@ -85,6 +92,10 @@ def plot_timeseries(pstore, names):
         pastastore interface
     names : list of str
         List of strings of observation timeseries
+    tmin : pd.Timestamp, optional
+        only plot data after tmin, by default None
+    tmax : pd.Timestamp, optional
+        only plot data before tmax, by default None
 
     Returns
     -------
@@ -98,14 +109,28 @@ def plot_timeseries(pstore, names):
     - For a single name, plots the timeseries data with different qualifiers and manual
       observations.
     - For multiple names, plots the timeseries data with markers and lines.
+    - If the total number of points exceeds `SERIES_POINT_BUDGET`, the budget is
+      divided over the time series and the larger series are downsampled, keeping
+      the minimum and maximum values. Downsampled series are plotted as lines.
     """
     if names is None:
         return {"layout": {"title": "No time series selected"}}
 
+    series = []
+    for ts in pstore.get_bulk("oseries", names):
+        if isinstance(ts, pd.DataFrame):
+            ts = ts.squeeze(axis=1)
+        series.append(ts.loc[tmin:tmax].dropna())
+    max_points = allocate_point_budget(
+        [ts.index.size for ts in series], settings["SERIES_POINT_BUDGET"]
+    )
+
     no_data = []
     traces = []
-    for name in names:
-        ts = pstore.get_oseries(name)
+    for name, ts, n in zip(names, series, max_points, strict=True):
+        ts = downsample_timeseries(ts, n)
+        # plot envelope of downsampled series as lines
+        mode = "lines" if n > 0 else "markers+lines"
 
         # no obs
         if ts.empty:
@@ -115,9 +140,9 @@ def plot_timeseries(pstore, names):
         if len(names) == 1:
             no_data.append(False)
             trace_i = go.Scattergl(
-                x=ts.index,
-                y=ts.values,
-                mode="markers+lines",
+                x=encode_array(ts.index),
+                y=encode_array(ts.values),
+                mode=mode,
                 line={"width": 1, "color": "gray"},
                 marker={"size": 3},
                 name=name,
@@ -128,9 +153,9 @@ def plot_timeseries(pstore, names):
         else:
             no_data.append(False)
             trace_i = go.Scattergl(
-                x=ts.index,
-                y=ts.values,
-                mode="markers+lines",
+                x=encode_array(ts.index),
+                y=encode_array(ts.values),
+                mode=mode,
                 line={"width": 1},
                 marker={"size": 3},
                 name=name,
@@ -140,6 +165,7 @@ def plot_timeseries(pstore, names):
             traces.append(trace_i)
 
     layout = {
+        "xaxis": {"type": "date"},
         "yaxis": {"title": "(m NAP)"},
         "legend": {
             "traceorder": "reversed+grouped",
@@ -151,7 +177,23 @@ def plot_timeseries(pstore, names):
         },
         "dragmode": "pan",
         "margin-top": 0,
+        # keep zoom when traces are updated for the visible window
+        "uirevision": ",".join(names),
     }
+    if any(max_points):
+        layout["annotations"] = [
+            {
+                "text": "Downsampled, zoom in for more detail",
+                "xref": "paper",
+                "yref": "paper",
+                "x": 1.0,
+                "y": 1.0,
+                "xanchor": "right",
+                "yanchor": "bottom",
+                "showarrow": False,
+                "font": {"size": 10, "color": "gray"},
+            }
+        ]
     if all(no_data):
         return None
     else:
@@ -1,15 +1,18 @@
+import numpy as np
 import plotly.express as px
 import plotly.graph_objs as go
-from dash import dcc
+from dash import Patch, dcc
 
 from pastasdash.application.cache import TIMEOUT, cache
 from pastasdash.application.components.shared import ids
 from pastasdash.application.datasource import PastaStoreInterface
 from pastasdash.application.settings import settings
 from pastasdash.application.utils import (
-    add_latlon_to_dataframe,
+    PointClusters,
     conditional_decorator,
+    encode_array,
     get_plotting_zoom_level_and_center_coordinates,
+    get_viewport,
 )
 
 
@@ -44,10 +47,18 @@ def plot_mapview(
 ):
     """Draw ScatterMap.
 
+    The figure without selection is built once per store version, the selection
+    and map extent are added to a (shallow) copy of that figure. For large networks
+    (see `use_clustering`), only the points and clusters in view are drawn.
+
     Parameters
     ----------
-    df : pandas.DataFrame
-        data to plot
+    pstore : PastaStoreInterface
+        pastastore interface
+    selected_data : list of int or list of str, optional
+        ids or names of selected oseries, by default None
+    update_extent : bool, optional
+        force map to update its extent, by default True
 
     Returns
     -------
@@ -55,88 +66,370 @@ def plot_mapview(
         dictionary containing plotly maplayout and mapdata
     """
     if pstore.empty:
-        maplayout = {
-            "margin": {"t": 0, "b": 0, "l": 0, "r": 0},
-            "font": {"color": "#000000", "size": 11},
-            "paper_bgcolor": "white",
-            "clickmode": "event+select",
-            "map": {
-                "bearing": 0,
-                "center": {"lon": 5.104480, "lat": 52.092876},
-                "pitch": 0,
-                "zoom": 5.5,
-                "style": "outdoors",
-            },
-            "legend": {"x": 0.01, "y": 0.99, "xanchor": "left", "yanchor": "top"},
-            "uirevision": False,
-            "modebar": {
-                "bgcolor": "rgba(255,255,255,0.9)",
-            },
-            "selectdirection": "d",
-        }
+        maplayout = build_map_layout(
+            center={"lon": 5.104480, "lat": 52.092876}, zoom=5.5
+        )
         return {"data": [{"type": "scattermap"}], "layout": maplayout}
-    oseries = add_latlon_to_dataframe(pstore.oseries)
-    stresses = add_latlon_to_dataframe(pstore.stresses)
 
+    pts_data = get_selected_ids(pstore, selected_data)
+    zoom, center = get_map_extent(pstore, pts_data)
+    if use_clustering(pstore):
+        viewport = get_viewport(center=center, zoom=zoom)
+        mapdata = get_clustered_mapdata(pstore, viewport, pts_data)
+        oseries_data = mapdata[0]
+    else:
+        figure = pstore.get_cached(
+            "mapview", lambda: build_mapview(pstore), ["oseries", "stresses"]
+        )
+        oseries_data = dict(figure["data"][0])
+        oseries_data["selectedpoints"] = pts_data
+        oseries_data["selectedData"] = (
+            None if pts_data is None else pstore.get_map_selection(pts_data)
+        )
+        mapdata = [oseries_data] + figure["data"][1:]
+
+    maplayout = build_map_layout(center, zoom)
+    if update_extent:
+        maplayout["uirevision"] = not bool(int(maplayout["uirevision"]))
+
+    return {"data": mapdata, "layout": maplayout}
+
+
+def patch_mapview_selection(pstore, selected_data):
+    """Update selection and extent of map drawn with plot_mapview.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    selected_data : list of int or list of str
+        ids or names of selected oseries
+
+    Returns
+    -------
+    Patch
+        patch updating the selected points, map center and zoom level, and the
+        points in view if points are clustered.
+    """
+    pts_data = get_selected_ids(pstore, selected_data)
+    zoom, center = get_map_extent(pstore, pts_data)
+    patch = Patch()
+    if use_clustering(pstore):
+        viewport = get_viewport(center=center, zoom=zoom)
+        patch["data"] = get_clustered_mapdata(pstore, viewport, pts_data)
+    else:
+        patch["data"][0]["selectedpoints"] = pts_data
+    patch["layout"]["map"]["center"] = center
+    patch["layout"]["map"]["zoom"] = zoom
+    return patch
+
+
+def get_mapview_selection(pstore, selected_data):
+    """Get selectedData of map drawn with plot_mapview or patch_mapview_selection.
+
+    If points are clustered, the point numbers refer to the points drawn after
+    zooming to the selection, see `get_clustered_mapdata`.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    selected_data : list of int or list of str
+        ids or names of selected oseries
+
+    Returns
+    -------
+    dict or None
+        selectedData dictionary, None if nothing is selected
+    """
+    pts_data = get_selected_ids(pstore, selected_data)
+    if pts_data is None:
+        return None
+    if not use_clustering(pstore):
+        return pstore.get_map_selection(pts_data)
+    zoom, center = get_map_extent(pstore, pts_data)
+    opts = query_clusters(pstore, get_viewport(center=center, zoom=zoom))[0]
+    return pstore.get_map_selection(pts_data, trace_ids=opts)
+
+
+def patch_mapview_viewport(pstore, selected_data, relayout_data):
+    """Update points and clusters in view after the map was moved or zoomed.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    selected_data : list of int or list of str
+        ids or names of selected oseries
+    relayout_data : dict
+        relayoutData of the map
+
+    Returns
+    -------
+    Patch or None
+        patch updating the map data, None if points are not clustered or the
+        viewport did not change.
+    """
+    if relayout_data is None or not use_clustering(pstore):
+        return None
+    viewport = get_viewport(relayout_data)
+    if viewport is None:
+        return None
+    pts_data = get_selected_ids(pstore, selected_data)
+    patch = Patch()
+    patch["data"] = get_clustered_mapdata(pstore, viewport, pts_data)
+    return patch
+
+
+def get_selected_names(pstore, selected_data):
+    """Get names of oseries selected on the map.
+
+    Box and lasso selections are resolved against the spatial index, so oseries
+    that are not drawn individually (e.g. because they are clustered) are also
+    selected. Clicked points are identified by the name of the oseries in their
+    customdata, the point number depends on the points in view.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    selected_data : dict
+        selectedData of the map
+
+    Returns
+    -------
+    list of str or None
+        names of the selected oseries, None if no oseries were selected
+    """
+    if selected_data is None:
+        return None
+    if "lassoPoints" in selected_data:
+        names = pstore.query_polygon("oseries", selected_data["lassoPoints"]["map"])
+    elif "range" in selected_data:
+        (lon0, lat0), (lon1, lat1) = selected_data["range"]["map"]
+        bounds = (min(lon0, lon1), min(lat0, lat1), max(lon0, lon1), max(lat0, lat1))
+        names = pstore.query_bbox("oseries", bounds)
+    else:
+        # only keep oseries, not stresses or clusters
+        names = [
+            pt.get("customdata", pt["text"])
+            for pt in selected_data["points"]
+            if pt["curveNumber"] == 0
+        ]
+    return names if len(names) > 0 else None
+
+
+def get_selected_ids(pstore, selected_data):
+    """Get ids of selected oseries.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    selected_data : list of int or list of str
+        ids or names of selected oseries
+
+    Returns
+    -------
+    list of int or None
+        ids of selected oseries, None if nothing is selected
+    """
+    if selected_data is None or len(selected_data) == 0:
+        return None
+    if isinstance(selected_data[0], int):
+        return list(selected_data)
+    elif isinstance(selected_data[0], str):
+        return pstore.get_oseries_ids(selected_data).tolist()
+    else:
+        raise ValueError("selected_data should be a list of integers or strings.")
+
+
+def get_map_extent(pstore, pts_data=None):
+    """Get zoom level and center of map showing (selected) oseries.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    pts_data : list of int, optional
+        ids of selected oseries, by default None, which shows all oseries
+
+    Returns
+    -------
+    zoom : float
+        zoom level
+    center : dict
+        map center, containing lat and lon
+    """
+    lookup = pstore.oseries_lookup
+    if pts_data is None:
+        zoom, center = get_plotting_zoom_level_and_center_coordinates(
+            lookup["lon"], lookup["lat"]
+        )
+        zoom = zoom - 1  # NOTE: manual correction to show all obs
+    else:
+        zoom, center = get_plotting_zoom_level_and_center_coordinates(
+            lookup["lon"][pts_data], lookup["lat"][pts_data]
+        )
+    return zoom, center
+
+
+def use_clustering(pstore):
+    """Check whether map points should be clustered.
+
+    Points are clustered if the total number of oseries and stresses exceeds
+    `MAP_CLUSTER_THRESHOLD`.
+    """
+    threshold = settings["MAP_CLUSTER_THRESHOLD"]
+    n = pstore.oseries_lookup["name"].size + pstore.stresses.index.size
+    return bool(threshold) and n > threshold
+
+
+def build_map_clusters(pstore):
+    """Build hierarchical clustering of oseries and stresses.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+
+    Returns
+    -------
+    dict of PointClusters
+        clustering of oseries and stresses, points are in the same order as the
+        oseries and stresses metadata.
+    """
+    lookup = pstore.oseries_lookup
+    stresses = pstore.stresses
+    radius = settings["MAP_CLUSTER_RADIUS"]
+    return {
+        "oseries": PointClusters(lookup["lon"], lookup["lat"], radius=radius),
+        "stresses": PointClusters(stresses["lon"], stresses["lat"], radius=radius),
+    }
+
+
+def query_clusters(pstore, viewport):
+    """Get points and clusters of oseries and stresses in view.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    viewport : dict
+        dictionary containing bounds and zoom, see `get_viewport`
+
+    Returns
+    -------
+    tuple
+        positions of the oseries drawn as points, oseries clusters, positions of
+        the stresses drawn as points and stresses clusters, see
+        `PointClusters.query`
+    """
+    clusters = pstore.get_cached(
+        "map_clusters", lambda: build_map_clusters(pstore), ["oseries", "stresses"]
+    )
+    max_points = settings["MAP_CLUSTER_THRESHOLD"]
+    opts, ocl = clusters["oseries"].query(**viewport, max_points=max_points)
+    spts, scl = clusters["stresses"].query(**viewport, max_points=max_points)
+    return opts, ocl, spts, scl
+
+
+def get_clustered_mapdata(pstore, viewport, pts_data=None):
+    """Get map data containing only the points and clusters in view.
+
+    The clustering is built once per store version. The traces are in the same
+    order as in build_mapview, followed by a cluster trace for the oseries and
+    one for the stresses.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+    viewport : dict
+        dictionary containing bounds and zoom, see `get_viewport`
+    pts_data : list of int, optional
+        ids of selected oseries, by default None
+
+    Returns
+    -------
+    list of dict
+        map data
+    """
+    opts, ocl, spts, scl = query_clusters(pstore, viewport)
+    oseries = pstore.oseries
+    stresses = pstore.stresses
+
+    oseries_data = get_oseries_trace(
+        oseries.iloc[opts], get_marker_size(oseries).iloc[opts]
+    )
+    if pts_data is not None:
+        # selected points are indexed by their position in the trace
+        selected = np.flatnonzero(np.isin(opts, pts_data))
+        oseries_data["selectedpoints"] = selected.tolist()
+        oseries_data["selectedData"] = pstore.get_map_selection(
+            pts_data, trace_ids=opts
+        )
+
+    stresses_data = get_stresses_traces(stresses.iloc[spts], get_kind_colors(stresses))
+
+    return (
+        [oseries_data]
+        + stresses_data
+        + [
+            get_cluster_trace(ocl, "Observation wells (clustered)", "darkslategray"),
+            get_cluster_trace(scl, "Stresses (clustered)", "gray"),
+        ]
+    )
+
+
+def get_marker_size(oseries):
+    """Get marker size for oseries, scaled by depth."""
     msize = 15 + 100 * (oseries["z"].max() - oseries["z"]) / (
         oseries["z"].max() - oseries["z"].min()
     )
-    msize.fillna(20, inplace=True)
-
-    if selected_data is not None:
-        if isinstance(selected_data[0], int):
-            pts_data = selected_data
-        elif isinstance(selected_data[0], str):
-            pts_data = oseries.loc[selected_data, "id"].tolist()
-        else:
-            raise ValueError("selected_data should be a list of integers or strings.")
-
-        # # attempt getting selected oseries on top, for better visibility in plot
-        # # highlighting
-        # reordered_idx = [i for i in oseries.index if i not in pts_data] + pts_data
-        # oseries = oseries.loc[reordered_idx]
-
-        selectedData = {
-            "points": [
-                {
-                    "curveNumber": 0,
-                    "pointNumber": idx,
-                    "pointIndex": idx,
-                    "lon": oseries.reset_index(drop=("name" in oseries.columns))
-                    .set_index("id")
-                    .loc[idx, "lon"],
-                    "lat": oseries.reset_index(drop=("name" in oseries.columns))
-                    .set_index("id")
-                    .loc[idx, "lat"],
-                    "text": oseries.reset_index(drop=("name" in oseries.columns))
-                    .set_index("id")
-                    .loc[idx, "name"],
-                }
-                for idx in pts_data
-            ]
-        }
-    else:
-        pts_data = None
-        selectedData = None
+    return msize.fillna(20)
 
-    # oseries data for map
-    oseries_data = {
-        "lat": oseries.loc[:, "lat"],
-        "lon": oseries.loc[:, "lon"],
+
+def get_kind_colors(stresses):
+    """Get marker color for each kind of stress."""
+    kind_dict = {}
+    for i, k in enumerate(stresses.kind.unique()):
+        kind_dict[k] = px.colors.qualitative.G10[i]
+    return kind_dict
+
+
+def get_oseries_trace(oseries, msize):
+    """Get map trace for oseries.
+
+    Parameters
+    ----------
+    oseries : pandas.DataFrame
+        oseries metadata
+    msize : pandas.Series
+        marker size for each oseries
+
+    Returns
+    -------
+    dict
+        map trace
+    """
+    return {
+        "lat": encode_array(oseries.loc[:, "lat"]),
+        "lon": encode_array(oseries.loc[:, "lon"]),
         "name": "Observation wells",
-        "customdata": oseries.loc[:, "z"],
+        "customdata": oseries.index.tolist(),
         "type": "scattermap",
         "text": oseries.index.tolist(),
         "textposition": "top center",
         "textfont": {"size": 12, "color": "black"},
         "mode": "markers",
         "marker": go.scattermap.Marker(
-            size=msize,
+            size=encode_array(msize),
             opacity=0.7,
             sizeref=0.5,
             sizemin=2,
             sizemode="area",
-            color=oseries["z"],
+            color=encode_array(oseries["z"]),
             colorscale=px.colors.sequential.Tealgrn,
             reversescale=False,
             showscale=True,
@@ -152,23 +445,36 @@ def plot_mapview(
         "hovertemplate": ("<b>%{text}</b><br>" + "<b>z:</b> NAP%{marker.color:.2f} m"),
         "showlegend": True,
         "legendgroup": "DATA",
-        "selectedpoints": pts_data,
+        "selectedpoints": None,
         "unselected": {"marker": {"opacity": 0.1}},
         "selected": {"marker": {"opacity": 1.0, "color": "black", "size": 9}},
-        "selectedData": selectedData,
+        "selectedData": None,
     }
 
-    # stresses data for map
-    kind_dict = {}
-    for i, k in enumerate(stresses.kind.unique()):
-        kind_dict[k] = px.colors.qualitative.G10[i]
 
+def get_stresses_traces(stresses, kind_dict):
+    """Get map traces for stresses, one trace for each kind.
+
+    Parameters
+    ----------
+    stresses : pandas.DataFrame
+        stresses metadata
+    kind_dict : dict
+        marker color for each kind of stress, a trace is returned for each kind,
+        even if there are no stresses of that kind.
+
+    Returns
+    -------
+    list of dict
+        map traces
+    """
     stresses_data = []
-    for kind, sdf in stresses.groupby("kind"):
+    for kind in sorted(k for k in kind_dict if isinstance(k, str)):
+        sdf = stresses.loc[stresses["kind"] == kind]
         stresses_data.append(
             {
-                "lat": sdf["lat"],
-                "lon": sdf["lon"],
+                "lat": encode_array(sdf["lat"]),
+                "lon": encode_array(sdf["lon"]),
                 "name": kind,
                 "type": "scattermap",
                 "text": sdf.index.tolist(),
@@ -195,25 +501,62 @@ def plot_mapview(
                 "selected": {"marker": {"opacity": 1.0}},
             }
         )
+    return stresses_data
 
-    mapdata = [oseries_data] + stresses_data
 
-    if selected_data is None:
-        zoom, center = get_plotting_zoom_level_and_center_coordinates(
-            oseries.lon.values, oseries.lat.values
-        )
-        zoom = zoom - 1  # NOTE: manual correction to show all obs
-    else:
-        sel = (
-            oseries.reset_index(drop=("name" in oseries.columns))
-            .set_index("id")
-            .loc[pts_data]
-        )
-        zoom, center = get_plotting_zoom_level_and_center_coordinates(
-            sel.lon.values, sel.lat.values
-        )
+def get_cluster_trace(clusters, name, color):
+    """Get map trace for clusters.
+
+    Parameters
+    ----------
+    clusters : dict
+        dictionary containing lon, lat and count of clusters
+    name : str
+        name of the trace
+    color : str
+        marker color
 
-    maplayout = {
+    Returns
+    -------
+    dict
+        map trace
+    """
+    return {
+        "lat": encode_array(clusters["lat"]),
+        "lon": encode_array(clusters["lon"]),
+        "name": name,
+        "type": "scattermap",
+        "text": [str(n) for n in clusters["count"]],
+        "mode": "markers+text",
+        "textfont": {"size": 10, "color": "white"},
+        "marker": {
+            "size": encode_array(12 + 4 * np.log2(clusters["count"])),
+            "color": color,
+            "opacity": 0.8,
+        },
+        "hovertemplate": "<b>%{text}</b> points<extra></extra>",
+        "showlegend": True,
+        "legendgroup": "CLUSTERS",
+        "unselected": {"marker": {"opacity": 0.8}},
+    }
+
+
+def build_map_layout(center, zoom):
+    """Build layout for ScatterMap.
+
+    Parameters
+    ----------
+    center : dict
+        map center, containing lat and lon
+    zoom : float
+        zoom level
+
+    Returns
+    -------
+    dict
+        map layout
+    """
+    return {
         # top, bottom, left and right margins
         "margin": {"t": 0, "b": 0, "l": 0, "r": 0},
         "font": {"color": "#000000", "size": 11},
@@ -239,7 +582,32 @@ def plot_mapview(
         "selectdirection": "d",
     }
 
-    if update_extent:
-        maplayout["uirevision"] = not bool(int(maplayout["uirevision"]))
+
+def build_mapview(pstore):
+    """Build ScatterMap figure without selection.
+
+    Parameters
+    ----------
+    pstore : PastaStoreInterface
+        pastastore interface
+
+    Returns
+    -------
+    dict
+        dictionary containing plotly maplayout and mapdata
+    """
+    oseries = pstore.oseries
+    stresses = pstore.stresses
+
+    # oseries data for map
+    oseries_data = get_oseries_trace(oseries, get_marker_size(oseries))
+
+    # stresses data for map
+    stresses_data = get_stresses_traces(stresses, get_kind_colors(stresses))
+
+    mapdata = [oseries_data] + stresses_data
+
+    zoom, center = get_map_extent(pstore)
+    maplayout = build_map_layout(center, zoom)
 
     return {"data": mapdata, "layout": maplayout}
@@ -18,12 +18,15 @@ ALERT_TIME_SERIES_CHART = "alert-time-series-chart"
 ALERT_PLOT_MODEL_RESULTS = "alert-plot-model-results"
 ALERT_SOLVE_MODEL = "alert-solve-model"
 ALERT_SAVE_MODEL = "alert-save-model"
+ALERT_MAP_SIGNATURES = "alert-map-signatures"
+ALERT_BATCH_SOLVE = "alert-batch-solve"
 
 # STORES
 SELECTED_OSERIES_STORE = "selected-oseries-store"
 PASTAS_MODEL_STORE = "pastas-model-store"
 DOWNLOAD_MAP_DATA_STORE = "download-map-data-store"
 PASTASTORE_CONFIG_FILE_STORE = "pastastore-config-file-store"
+SESSION_ID_STORE = "session-id-store"
 
 # TABS
 TAB_CONTAINER = "tab-container"
@@ -49,7 +52,16 @@ MODEL_SOLVE_BUTTON = "model-generate-button"
 MODEL_SAVE_BUTTON = "model-save-button"
 MODEL_RESULTS_CHART = "model-results-chart"
 MODEL_DIAGNOSTICS_CHART = "model-diagnostics-chart"
+MODEL_DIAGNOSTICS_SWITCH = "model-diagnostics-switch"
+MODEL_RESULTS_COLUMN = "model-results-column"
+MODEL_DIAGNOSTICS_COLUMN = "model-diagnostics-column"
 MODEL_USE_ONLY_VALIDATED = "model-use-only-validated-checkbox"
+MODEL_SOLVE_WARM_START = "model-solve-warm-start"
+MODEL_SOLVE_PROGRESS = "model-solve-progress"
+MODEL_SOLVE_PROGRESS_DIV = "model-solve-progress-div"
+MODEL_SOLVE_CANCEL_BUTTON = "model-solve-cancel-button"
+MODEL_SOLVE_INTERVAL = "model-solve-interval"
+MODEL_SOLVE_JOB_STORE = "model-solve-job-store"
 
 # COMPARE TAB
 COMPARE_MAP = "compare-map"
@@ -60,6 +72,13 @@ COMPARE_MODEL_SELECTION_DROPDOWN = "compare-model-selection-dropdown"
 COMPARE_MODELS_CHART = "compare-models-chart"
 COMPARE_TABLE_SELECT_ALL_BUTTON = "compare-table-select-all-button"
 COMPARE_TABLE_DESELECT_ALL_BUTTON = "compare-table-deselect-all-button"
+COMPARE_BATCH_SOLVE_BUTTON = "compare-batch-solve-button"
+COMPARE_BATCH_SOLVE_PROGRESS = "compare-batch-solve-progress"
+COMPARE_BATCH_SOLVE_PROGRESS_DIV = "compare-batch-solve-progress-div"
+COMPARE_BATCH_SOLVE_CANCEL_BUTTON = "compare-batch-solve-cancel-button"
+COMPARE_BATCH_SOLVE_INTERVAL = "compare-batch-solve-interval"
+COMPARE_BATCH_SOLVE_JOB_STORE = "compare-batch-solve-job-store"
+COMPARE_BATCH_SOLVE_TABLE = "compare-batch-solve-table"
 
 # MAP TAB
 MAP_DROPDOWN_SELECTION = "mapresult-dropdown-selection"
@@ -68,9 +87,17 @@ MAP_COLORMAP_SELECTION = "map-colormap-selection"
 MAP_RENDER_BUTTON = "map-render-button"
 REVERSE_COLORMAP_CHECKBOX = "reverse-colormap-checkbox"
 DOWNLOAD_MAPDATA_BUTTON = "download-mapdata-button"
-DOWNLOAD_MAPDATA = "download-mapdata"
+DOWNLOAD_MAPDATA_CSV = "download-mapdata-csv"
+DOWNLOAD_MAPDATA_PARQUET = "download-mapdata-parquet"
+DOWNLOAD_MAPDATA_GPKG = "download-mapdata-gpkg"
 MAPDATA_CMAP_MIN = "mapdata-cmap-min"
 MAPDATA_CMAP_MAX = "mapdata-cmap-max"
+MAP_SIGNATURE_PROGRESS = "map-signature-progress"
+MAP_SIGNATURE_PROGRESS_DIV = "map-signature-progress-div"
+MAP_SIGNATURE_CANCEL_BUTTON = "map-signature-cancel-button"
+MAP_SIGNATURE_INTERVAL = "map-signature-interval"
+MAP_SIGNATURE_JOB_STORE = "map-signature-job-store"
+MAP_SIGNATURE_DONE_STORE = "map-signature-done-store"
 
 
 # DUPLICATE CALLBACK STORES
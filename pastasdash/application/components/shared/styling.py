@@ -1,54 +1,59 @@
+import functools
+
 import plotly.express as px
-import plotly.graph_objects as go
-from dash import dcc
+from dash import html
+
+
+@functools.lru_cache
+def get_colormap_swatches(source="sequential"):
+    """Get colormap swatches for use as dropdown labels.
 
+    Swatches are rendered as a CSS linear gradient, so no plotly figure has to be
+    created for each colormap. Swatches are built once and cached.
 
-def get_colormap_figures(source=px.colors.sequential):
+    Parameters
+    ----------
+    source : str, optional
+        name of the plotly colors module, "sequential", "diverging" or
+        "cyclical", by default "sequential"
+
+    Returns
+    -------
+    dict
+        dictionary of colormap name and html.Div containing the swatch
+    """
+    colors = getattr(px.colors, source)
     sequences = [
-        (k, getattr(source, k))
-        for k in dir(source)
+        (k, getattr(colors, k))
+        for k in dir(colors)
         if not (k.startswith("_") or k.startswith("swatches") or k.endswith("_r"))
     ]
 
-    n = 200
-
     cmap_dict = {}
-    for name, _ in sequences:
-        fig = dcc.Graph(
-            figure=go.Figure(
-                data=[
-                    go.Bar(
-                        orientation="h",
-                        y=[f"{name:<10s}"] * n,
-                        x=[1] * n,
-                        customdata=[(x + 1) / n for x in range(n)],
-                        marker={
-                            "color": list(range(n)),
-                            "colorscale": name,
-                            "line_width": 0,
-                        },
-                        hovertemplate="%{customdata}",
-                        name=name,
-                        width=1.0,
-                    )
-                ],
-                layout={
-                    "barmode": "stack",
-                    "barnorm": "fraction",
-                    "showlegend": False,
-                    "xaxis": {
-                        "range": [0.00, 1.00],
-                        "showticklabels": False,
-                        "showgrid": False,
+    for name, sequence in sequences:
+        n = len(sequence)
+        stops = ", ".join(
+            f"{color} {100 * i / max(n - 1, 1):.1f}%"
+            for i, color in enumerate(sequence)
+        )
+        cmap_dict[name] = html.Div(
+            [
+                html.Span(
+                    name,
+                    style={"display": "inline-block", "width": 90, "fontSize": 12},
+                ),
+                html.Span(
+                    style={
+                        "display": "inline-block",
+                        "width": 125,
+                        "height": 16,
+                        "verticalAlign": "middle",
+                        "background": f"linear-gradient(to right, {stops})",
                     },
-                    "height": 30,
-                    "width": 225,
-                    "margin": {"l": 0, "r": 0, "t": 5, "b": 0},
-                },
-            ),
-            config={"displayModeBar": False},
+                ),
+            ],
+            title=name,
         )
-        cmap_dict[name] = fig
     return cmap_dict
 
 
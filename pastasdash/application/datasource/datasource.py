@@ -1,16 +1,134 @@
 import functools
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
+import pastas as ps
 import pastastore as pst
 
+from pastasdash.application.datasource.figurecache import FigureCache
+from pastasdash.application.datasource.index import (
+    ParameterCatalog,
+    ResultsMatrix,
+    SignatureIndex,
+    TimeSeriesStatsIndex,
+    get_library_markers,
+    get_model_fingerprints,
+    get_model_links,
+    get_store_cache_dir,
+)
+from pastasdash.application.datasource.modelcache import (
+    ModelCache,
+    ModelStagingArea,
+)
+from pastasdash.application.datasource.signatures import (
+    SignatureEngine,
+    compute_signatures,
+)
+from pastasdash.application.datasource.simulation import (
+    SimulationCache,
+    get_simulation_key,
+)
+from pastasdash.application.datasource.solver import BatchSolver, SolveQueue
+from pastasdash.application.datasource.spatial import SpatialIndex
 from pastasdash.application.settings import settings
 from pastasdash.application.utils import add_latlon_to_dataframe
 
+logger = logging.getLogger(__name__)
+
 # TODO:
 # Ensure x, y coordinates provided
 # Ensure screen_top, screen_bot for oseries?
 
+# libraries containing the data of the PastaStore
+LIBNAMES = ["oseries", "stresses", "models"]
+
+# PastaStore methods that write to the database, mapped to the library they modify.
+# Calling any of these through the interface invalidates the cached frames. None means
+# the library is passed as the libname argument.
+WRITE_METHODS = {
+    "add_oseries": "oseries",
+    "update_oseries": "oseries",
+    "upsert_oseries": "oseries",
+    "del_oseries": "oseries",
+    "add_stress": "stresses",
+    "update_stress": "stresses",
+    "upsert_stress": "stresses",
+    "del_stress": "stresses",
+    "add_recharge": "stresses",
+    "add_model": "models",
+    "del_model": "models",
+    "del_models": "models",
+    "solve_models": "models",
+    "update_metadata": None,
+    "empty_library": None,
+}
+
+
+def get_written_names(func, args, kwargs):
+    """Get names of items written by a PastaStore write method.
+
+    Parameters
+    ----------
+    func : callable
+        PastaStore write method
+    args : tuple
+        positional arguments passed to func
+    kwargs : dict
+        keyword arguments passed to func
+
+    Returns
+    -------
+    libname : str or None
+        name of the library passed to func, if any
+    names : list of str or None
+        names of the written items, None if these cannot be determined.
+    """
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs).arguments
+    except TypeError:
+        return None, None
+    libname = bound.get("libname")
+    for key in ["name", "names", "modelnames"]:
+        if key in bound and bound[key] is not None:
+            names = bound[key]
+            return libname, [names] if isinstance(names, str) else list(names)
+    if "ml" in bound:
+        ml = bound["ml"]
+        return libname, [ml["name"] if isinstance(ml, dict) else ml.name]
+    return libname, None
+
+
+def read_concurrently(func, names, max_workers=None):
+    """Call read function for each name using a thread pool.
+
+    Parameters
+    ----------
+    func : callable
+        function that reads a single item, must accept the name as argument
+    names : list of str
+        names of the items to read
+    max_workers : int, optional
+        number of threads, by default None, which uses `READ_WORKERS` from the
+        settings. Items are read serially if this is 1.
+
+    Returns
+    -------
+    list
+        results of func for each name, in the same order as names
+    """
+    if max_workers is None:
+        max_workers = settings["READ_WORKERS"]
+    max_workers = min(max_workers, len(names))
+    if max_workers <= 1:
+        return [func(name) for name in names]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, names))
+
 
 def get_timeseries_stats(name, pstore):
     o = pstore.get_oseries(name)
@@ -21,10 +139,64 @@ def get_timeseries_stats(name, pstore):
             "n_observations": o.index.size,
         }
     )
-    s.index.name = name
+    s.name = name
     return s
 
 
+def get_model_parameters(name, pstore):
+    mldict = pstore.get_models(name, return_dict=True)
+    params = mldict["parameters"].loc[:, ["optimal", "stderr"]]
+    params.index.name = "parameter"
+    params = params.reset_index()
+    params.index = pd.Index([name] * params.index.size, name="name")
+    return params
+
+
+def get_model_results(name, pstore):
+    """Compute parameters and metrics for a model.
+
+    Metrics that cannot be computed are set to NaN.
+
+    Parameters
+    ----------
+    name : str
+        name of the model
+    pstore : pastastore.PastaStore
+        PastaStore object
+
+    Returns
+    -------
+    pandas.Series
+        model results, indexed by "<type>:<name>"
+    """
+    ml = pstore.get_models(name)
+    results = ml.parameters["optimal"].add_prefix("parameter:").to_dict()
+    for metric in ps.modelstats.Statistics.ops:
+        try:
+            results[f"metric:{metric}"] = getattr(ml.stats, metric)()
+        except Exception:
+            results[f"metric:{metric}"] = np.nan
+    return pd.Series(results, name=name, dtype=float)
+
+
+def get_oseries_signatures(name, pstore):
+    """Compute groundwater signatures for an oseries.
+
+    Parameters
+    ----------
+    name : str
+        name of the oseries
+    pstore : pastastore.PastaStore
+        PastaStore object
+
+    Returns
+    -------
+    pandas.Series
+        signatures, indexed by signature name
+    """
+    return compute_signatures({name: pstore.get_oseries(name)}).loc[name]
+
+
 class PastaStoreInterface:
     """PastaStoreInterface object is a thin wrapper around PastaStore.
 
@@ -71,7 +243,47 @@ class PastaStoreInterface:
 
         self.crs = crs
         self.registered_funcs = []
+        self._version = 0
+        self._frames = {}
+        self._generations = dict.fromkeys(LIBNAMES, 0)
+        self._model_fingerprints = {}
+        self._frames_lock = threading.Lock()
+        self._markers = {}
+        self._refresh_lock = threading.Lock()
+        self._stats_index = TimeSeriesStatsIndex(self.pstore, get_timeseries_stats)
+        self._param_catalog = ParameterCatalog(self.pstore, get_model_parameters)
+        self._results = ResultsMatrix(
+            self.pstore, get_model_results, links=lambda: self.model_links
+        )
+        self._signatures = SignatureIndex(self.pstore, get_oseries_signatures)
+        self.signature_engine = SignatureEngine(
+            self._signatures,
+            lambda names: self.get_bulk("oseries", names),
+            max_workers=settings["SIGNATURE_WORKERS"],
+            chunksize=settings["SIGNATURE_CHUNKSIZE"],
+        )
+        self._model_cache = ModelCache(settings["MODEL_CACHE_SIZE"] * 1024**2)
+        self._figure_cache = FigureCache(settings["FIGURE_CACHE_SIZE"] * 1024**2)
+        self.batch_solver = self._create_batch_solver()
+        self.solve_queue = SolveQueue(
+            max_workers=settings["SOLVE_WORKERS"],
+            max_jobs_per_user=settings["SOLVE_JOBS_PER_USER"],
+            abandon_timeout=settings["SOLVE_ABANDON_TIMEOUT"],
+        )
+        self.staging = ModelStagingArea(
+            settings["STAGING_TTL"], settings["STAGING_PER_SESSION"]
+        )
+        self._sim_cache = SimulationCache(
+            get_store_cache_dir(self.pstore) / "sim",
+            maxbytes=settings["SIMULATION_CACHE_SIZE"] * 1024**2,
+        )
         self._register_pastastore_methods()
+        if settings["REFRESH_INTERVAL"] > 0:
+            threading.Thread(
+                target=self._refresh_loop,
+                args=(settings["REFRESH_INTERVAL"],),
+                daemon=True,
+            ).start()
 
     def set_pastastore(self, pstore):
         """Set PastaStore object.
@@ -89,6 +301,257 @@ class PastaStoreInterface:
                 delattr(self, func_or_attr)
         self._check_pastastore_metadata()
         self._register_pastastore_methods()
+        self.signature_engine.cancel()
+        self.batch_solver.cancel()
+        self.batch_solver = self._create_batch_solver()
+        self._stats_index = TimeSeriesStatsIndex(self.pstore, get_timeseries_stats)
+        self._param_catalog = ParameterCatalog(self.pstore, get_model_parameters)
+        self._results = ResultsMatrix(
+            self.pstore, get_model_results, links=lambda: self.model_links
+        )
+        self._signatures = SignatureIndex(self.pstore, get_oseries_signatures)
+        self.signature_engine = SignatureEngine(
+            self._signatures,
+            lambda names: self.get_bulk("oseries", names),
+            max_workers=settings["SIGNATURE_WORKERS"],
+            chunksize=settings["SIGNATURE_CHUNKSIZE"],
+        )
+        # staged models belong to the previous pastastore
+        self.staging = ModelStagingArea(
+            settings["STAGING_TTL"], settings["STAGING_PER_SESSION"]
+        )
+        self._sim_cache = SimulationCache(
+            get_store_cache_dir(self.pstore) / "sim",
+            maxbytes=settings["SIMULATION_CACHE_SIZE"] * 1024**2,
+        )
+        with self._refresh_lock:
+            self._markers = {}
+        self.invalidate()
+
+    def _create_batch_solver(self):
+        """Create batch solver for the current PastaStore.
+
+        A batch that is still running when the PastaStore is replaced, reads and
+        writes the models of the PastaStore that started it.
+        """
+        pstore = self.pstore
+
+        def read(names):
+            if pstore is self.pstore:
+                return self.get_bulk("models", names)
+            return [pstore.get_models(name) for name in names]
+
+        def write(ml):
+            if pstore is self.pstore:
+                self.add_model(ml, overwrite=True)
+            else:
+                pstore.add_model(ml, overwrite=True)
+
+        return BatchSolver(
+            read,
+            write,
+            max_workers=settings["BATCH_SOLVE_WORKERS"],
+            chunksize=settings["BATCH_SOLVE_CHUNKSIZE"],
+        )
+
+    @property
+    def version(self):
+        """Version of the PastaStore contents, incremented on every write."""
+        return self._version
+
+    def get_cached(self, key, func, libnames=None):
+        """Get object derived from the PastaStore, built once per store version.
+
+        The object is rebuilt after one of the libraries it is derived from is
+        modified. An object that was being built while the PastaStore was
+        modified is returned, but not cached.
+
+        Parameters
+        ----------
+        key : str
+            name of the cached object
+        func : callable
+            function without arguments that builds the object
+        libnames : list of str, optional
+            names of the libraries the object is derived from, by default None,
+            which means the object depends on all libraries.
+
+        Returns
+        -------
+        object
+            cached object, shared between callers so it should not be modified
+        """
+        libnames = LIBNAMES if libnames is None else list(libnames)
+        with self._frames_lock:
+            if key in self._frames:
+                return self._frames[key][1]
+            generations = [self._generations[lib] for lib in libnames]
+        obj = func()
+        with self._frames_lock:
+            if generations == [self._generations[lib] for lib in libnames]:
+                self._frames.setdefault(key, (libnames, obj))
+        return obj
+
+    def invalidate(self, libname=None, names=None):
+        """Invalidate cached frames derived from the PastaStore.
+
+        Parameters
+        ----------
+        libname : str, optional
+            name of the library that was modified, by default None, which
+            invalidates everything.
+        names : list of str, optional
+            names of the modified items, by default None, which means all items in
+            the library are considered modified.
+        """
+        libnames = [libname] if libname in LIBNAMES else LIBNAMES
+        with self._frames_lock:
+            self._version += 1
+            for lib in libnames:
+                self._generations[lib] += 1
+            for key, (depends, _) in list(self._frames.items()):
+                if not set(depends).isdisjoint(libnames):
+                    del self._frames[key]
+            if libname == "models" and names is not None:
+                for name in names:
+                    self._model_fingerprints.pop(name, None)
+            else:
+                # models are fingerprinted with their time series
+                self._model_fingerprints.clear()
+        if libname in [None, "oseries"]:
+            self._stats_index.mark_dirty(names)
+            self._signatures.mark_dirty(names)
+        if libname in [None, "models"]:
+            self._param_catalog.mark_dirty(names)
+            self._results.mark_dirty(names)
+        elif libname == "oseries":
+            # models are loaded with the stored oseries
+            if names is None:
+                self._results.mark_dirty()
+            else:
+                oseries_models = self.oseries_models
+                self._results.mark_dirty(
+                    [ml for n in names for ml in oseries_models.get(n, [])]
+                )
+        elif libname == "stresses":
+            # metrics depend on the stresses, which are part of the fingerprint
+            self._results.mark_dirty()
+        # models contain the stored time series, so clear all models if those change
+        self._model_cache.evict(names if libname == "models" else None)
+        self._figure_cache.evict(names if libname == "models" else None)
+        # simulations depend on stresses and models, but not on oseries
+        if libname == "models":
+            self._sim_cache.evict(names)
+        elif libname == "stresses":
+            self._sim_cache.evict()
+
+    def refresh(self):
+        """Check the PastaStore for changes made outside this interface.
+
+        Items written by other processes, e.g. a scheduled job that adds new
+        observations, are detected by comparing the markers of all stored items
+        to those of the previous check, see `get_library_markers`. Cached data
+        derived from modified items is invalidated. This check is done in a
+        background thread every `REFRESH_INTERVAL` seconds, requests never wait
+        for it. Connectors without markers are not checked.
+
+        Returns
+        -------
+        dict
+            names of the modified items for each library that changed
+        """
+        with self._refresh_lock:
+            pstore = self.pstore
+            changed = {}
+            for libname in LIBNAMES:
+                markers = get_library_markers(pstore, libname)
+                if markers is None:
+                    continue
+                previous = self._markers.get(libname)
+                self._markers[libname] = markers
+                if previous is None:
+                    # first check, cached data is validated when it is built
+                    continue
+                names = markers.index.union(previous.index)
+                modified = names[markers.reindex(names).ne(previous.reindex(names))]
+                if not modified.empty:
+                    changed[libname] = modified.tolist()
+            for libname, names in changed.items():
+                # item names and model links are cached by pastastore
+                pstore.conn._clear_cache(libname)
+                if libname == "models":
+                    pstore.conn._clear_cache("oseries_models")
+                    pstore.conn._clear_cache("stresses_models")
+                self.invalidate(libname, names)
+            return changed
+
+    def _refresh_loop(self, interval):
+        """Check the PastaStore for changes every interval seconds."""
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Checking the PastaStore for changes failed.")
+            time.sleep(interval)
+
+    def _update_markers(self, libname=None, names=None):
+        """Update markers of items written through this interface.
+
+        Parameters
+        ----------
+        libname : str, optional
+            name of the written library, by default None, which updates all
+            libraries.
+        names : list of str, optional
+            names of the written items, by default None, which updates all items
+        """
+        libnames = [libname] if libname in LIBNAMES else LIBNAMES
+        with self._refresh_lock:
+            for lib in libnames:
+                if lib not in self._markers:
+                    continue
+                markers = get_library_markers(self.pstore, lib)
+                if names is not None:
+                    # changes to other items are detected by the next check
+                    previous = self._markers[lib].drop(names, errors="ignore")
+                    markers = pd.concat(
+                        [previous, markers.loc[markers.index.isin(names)]]
+                    )
+                self._markers[lib] = markers
+
+    @property
+    def oseries_models(self):
+        """Names of the models of each oseries.
+
+        Read from the PastaStore once per version of the models library, so
+        models written by other processes are included after they are detected,
+        see `refresh`.
+        """
+        return self.get_cached(
+            "oseries_models", lambda: self._read_links("oseries_models"), ["models"]
+        )
+
+    @property
+    def stresses_models(self):
+        """Names of the models of each stress, see `oseries_models`."""
+        return self.get_cached(
+            "stresses_models", lambda: self._read_links("stresses_models"), ["models"]
+        )
+
+    @property
+    def model_links(self):
+        """Time series used by each model, see `get_model_links`."""
+        return self.get_cached(
+            "model_links",
+            lambda: get_model_links(self.oseries_models, self.stresses_models),
+            ["models"],
+        )
+
+    def _read_links(self, libname):
+        # the links are cached by the connector, which does not notice changes
+        # made by other processes
+        self.pstore.conn._clear_cache(libname)
+        return dict(getattr(self.pstore.conn, libname))
 
     def _check_pastastore_metadata(self):
         """Check if required metadata is in PastaStore."""
@@ -123,33 +586,330 @@ class PastaStoreInterface:
         self.registered_funcs = to_register
 
         for obj in to_register:
-            setattr(self, obj, getattr(self.pstore, obj))
-
-    @functools.lru_cache()  # noqa: B019
-    def oseries_stats(self, oseries_names):
-        return self.pstore.apply(
-            "oseries",
-            get_timeseries_stats,
-            names=oseries_names,
-            kwargs={"pstore": self.pstore},
-            parallel=settings["PARALLEL"],
-            fancy_output=True,
-        ).T
+            if obj in WRITE_METHODS:
+                setattr(self, obj, self._wrap_write_method(obj))
+            else:
+                setattr(self, obj, getattr(self.pstore, obj))
+
+    def get_models(self, names, return_dict=False, squeeze=True, copy=True, **kwargs):
+        """Load models from PastaStore, using the model cache.
+
+        Models are cached by name and fingerprint, see `get_model_fingerprint`,
+        so a model that was read while it was being overwritten is not returned
+        after the write.
+
+        Parameters
+        ----------
+        names : str or list of str
+            names of the models to load
+        return_dict : bool, optional
+            return model dictionary instead of pastas.Model, by default False.
+            Model dictionaries are not cached.
+        squeeze : bool, optional
+            if True return Model instead of list of Models for single entry
+        copy : bool, optional
+            return copies of the cached models, by default True. Cached models are
+            shared by all threads and must not be modified, pastas modifies a
+            model when it is solved or simulated. Only pass False if the models
+            are only read, e.g. to get their parameters or settings.
+        **kwargs
+            passed on to PastaStore.get_models
+
+        Returns
+        -------
+        pastas.Model or list of pastas.Model
+            model, or list of models if multiple names were passed
+        """
+        if return_dict or kwargs:
+            return self.pstore.get_models(
+                names, return_dict=return_dict, squeeze=squeeze, **kwargs
+            )
+        names = self.pstore.conn.parse_names(names, libname="models")
+        keys = {name: self.get_model_fingerprint(name) for name in names}
+        cached = {name: self._model_cache.get(name, keys[name]) for name in names}
+        missing = [name for name, ml in cached.items() if ml is None]
+        for name, ml in zip(
+            missing, read_concurrently(self.pstore.get_models, missing), strict=True
+        ):
+            self._model_cache.put(name, keys[name], ml)
+            cached[name] = ml
+        models = [
+            cached[name].copy(name=cached[name].name) if copy else cached[name]
+            for name in names
+        ]
+        if len(models) == 1 and squeeze:
+            return models[0]
+        return models
+
+    def get_bulk(self, libname, names, max_workers=None):
+        """Read multiple time series or models concurrently.
+
+        Reading from a PastaStore on disk or in a database is mostly I/O bound, so
+        items are read concurrently using a thread pool.
+
+        Parameters
+        ----------
+        libname : str
+            name of the library, "oseries", "stresses" or "models"
+        names : str or list of str
+            names of the items to read
+        max_workers : int, optional
+            number of threads, by default None, which uses `READ_WORKERS` from the
+            settings.
+
+        Returns
+        -------
+        list of pandas.Series or list of pastas.Model
+            time series or models in the same order as names
+        """
+        names = self.pstore.conn.parse_names(names, libname=libname)
+        if libname == "models":
+            return self.get_models(names, squeeze=False)
+        read = (
+            self.pstore.get_oseries
+            if libname == "oseries"
+            else self.pstore.get_stresses
+        )
+        return read_concurrently(read, names, max_workers=max_workers)
+
+    def get_model_fingerprint(self, name):
+        """Get fingerprint of a model and the time series it uses.
+
+        The fingerprint is computed once and memoized until the model or the time
+        series are invalidated, see `get_model_fingerprints`.
+
+        Parameters
+        ----------
+        name : str
+            name of the model
+
+        Returns
+        -------
+        str
+            fingerprint of the model
+        """
+        with self._frames_lock:
+            fingerprint = self._model_fingerprints.get(name)
+            if fingerprint is not None:
+                return fingerprint
+            generations = dict(self._generations)
+        fingerprint = get_model_fingerprints(
+            self.pstore, [name], links=self.model_links
+        ).iloc[0]
+        with self._frames_lock:
+            # not memoized if the store was modified in the meantime
+            if generations == self._generations:
+                self._model_fingerprints[name] = fingerprint
+        return fingerprint
+
+    def get_simulation(self, name, tmin=None, tmax=None, freq=None):
+        """Get simulated heads and contributions of a stored model.
+
+        Simulations are stored in a persistent cache, keyed by model name, the
+        fingerprints of the model and its time series, tmin, tmax and freq.
+        Cached simulations are removed when the model is overwritten, and the
+        least-recently-used simulations are removed when the cache exceeds
+        `SIMULATION_CACHE_SIZE`.
+
+        Parameters
+        ----------
+        name : str
+            name of the model
+        tmin : pd.Timestamp or str, optional
+            start of the simulation, by default None
+        tmax : pd.Timestamp or str, optional
+            end of the simulation, by default None
+        freq : str, optional
+            frequency of the simulation, by default None
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame with the simulation in the column 'simulation' and the
+            contributions of the stress models in the other columns.
+        """
+        fingerprint = self.get_model_fingerprint(name)
+        key = get_simulation_key(fingerprint, tmin=tmin, tmax=tmax, freq=freq)
+        sim = self._sim_cache.get(name, key)
+        if sim is None:
+            ml = self.get_models(name)
+            kwargs = {"tmin": tmin, "tmax": tmax, "freq": freq}
+            sim = pd.concat(
+                [ml.simulate(**kwargs).rename("simulation")]
+                + ml.get_contributions(split=False, **kwargs),
+                axis=1,
+            )
+            sim.columns = sim.columns.astype(str)
+            self._sim_cache.put(name, key, sim)
+        return sim
+
+    def get_simulations(self, names, tmin=None, tmax=None, freq=None):
+        """Get simulated heads and contributions of multiple stored models.
+
+        Simulations that are not cached are computed concurrently, see
+        get_simulation().
+
+        Returns
+        -------
+        list of pandas.DataFrame
+            simulations in the same order as names
+        """
+        return read_concurrently(
+            functools.partial(self.get_simulation, tmin=tmin, tmax=tmax, freq=freq),
+            names,
+        )
+
+    @property
+    def model_cache_info(self):
+        """Hits, misses, size and memory use of the model cache."""
+        return self._model_cache.info()
+
+    def get_model_figure(self, name, kind, stderr=False):
+        """Get results or diagnostics figure of a stored model.
+
+        Figures are stored in a memory-bounded cache, keyed by model name, the
+        fingerprints of the model and its time series and plot options. Cached
+        figures are removed when the model is overwritten.
+
+        Parameters
+        ----------
+        name : str
+            name of the model
+        kind : str
+            kind of figure, "results" or "diagnostics"
+        stderr : bool, optional
+            show the standard error of the parameters in the results figure, by
+            default False
+
+        Returns
+        -------
+        plotly.graph_objects.Figure or dict
+            figure, cached figures are returned as dictionary
+        """
+        if kind not in ["results", "diagnostics"]:
+            raise ValueError(f"Unknown figure kind '{kind}'.")
+        fingerprint = self.get_model_fingerprint(name)
+        key = f"{fingerprint}:{stderr}"
+        fig = self._figure_cache.get(name, kind, key)
+        if fig is None:
+            ml = self.get_models(name)
+            if kind == "results":
+                fig = ml.plotly.results(stderr=stderr)
+            else:
+                fig = ml.plotly.diagnostics()
+            self._figure_cache.put(name, kind, key, fig)
+        return fig
+
+    @property
+    def figure_cache_info(self):
+        """Hits, misses, size and memory use of the figure cache."""
+        return self._figure_cache.info()
+
+    def get_model(self, names, return_dict=False, squeeze=True, copy=True, **kwargs):
+        """Load models from PastaStore, using the model cache.
+
+        Alias for get_models().
+        """
+        return self.get_models(
+            names, return_dict=return_dict, squeeze=squeeze, copy=copy, **kwargs
+        )
+
+    def _wrap_write_method(self, method):
+        """Wrap PastaStore write method so that cached frames are invalidated."""
+        func = getattr(self.pstore, method)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            libname, names = get_written_names(func, args, kwargs)
+            libname = WRITE_METHODS[method] or libname
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.invalidate(libname, names)
+                # so the next refresh does not invalidate the written items again
+                self._update_markers(libname, names)
+
+        return wrapper
+
+    def oseries_stats(self, oseries_names=None):
+        """Get tmin, tmax and number of observations for oseries.
+
+        Statistics are read from the persistent statistics index, and only
+        recomputed for oseries that were modified since the index was last updated.
+
+        Parameters
+        ----------
+        oseries_names : list of str, optional
+            names of oseries, by default None, which returns all oseries.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame containing tmin, tmax and n_observations
+        """
+        self._stats_index.update()
+        return self._stats_index.get(oseries_names)
+
+    def count_observations(self, oseries_names):
+        """Get total number of observations in oseries.
+
+        Parameters
+        ----------
+        oseries_names : list of str
+            names of oseries
+
+        Returns
+        -------
+        int
+            total number of observations
+        """
+        return int(self.oseries_stats(oseries_names)["n_observations"].sum())
+
+    def exceeds_point_limit(self, oseries_names):
+        """Check whether oseries contain too many observations to load at once.
+
+        Parameters
+        ----------
+        oseries_names : list of str
+            names of oseries
+
+        Returns
+        -------
+        bool
+            True if the total number of observations exceeds `SERIES_POINT_LIMIT`
+        """
+        if oseries_names is None:
+            return False
+        return self.count_observations(oseries_names) > settings["SERIES_POINT_LIMIT"]
+
+    def _add_latlon(self, df):
+        """Add lat/lon columns, only reprojecting if these are not in the metadata."""
+        lat, lon = self.column_mapping["lat"], self.column_mapping["lon"]
+        if lat in df.columns and lon in df.columns:
+            df["lat"] = df[lat]
+            df["lon"] = df[lon]
+            return df
+        return add_latlon_to_dataframe(
+            df,
+            crs_from=self.crs,
+            x_col=self.column_mapping["x"],
+            y_col=self.column_mapping["y"],
+        )
 
     @property
     def oseries(self):
+        """Oseries metadata, including lat/lon, depth and statistics.
+
+        The frame is built once per store version. A shallow copy is returned, so
+        callers can add columns, but should not modify values in place.
+        """
+        oseries = self.get_cached("oseries", self._build_oseries, ["oseries"])
+        return oseries.copy(deep=False)
+
+    def _build_oseries(self):
         oseries = self.pstore.oseries.copy()
         if not oseries.empty:
-            if (
-                self.column_mapping["lat"] not in oseries.columns
-                or self.column_mapping["lon"] not in oseries.columns
-            ):
-                oseries = add_latlon_to_dataframe(
-                    oseries,
-                    crs_from=self.crs,
-                    x_col=self.column_mapping["x"],
-                    y_col=self.column_mapping["y"],
-                )
+            oseries = self._add_latlon(oseries)
             oseries["kind"] = "oseries"
 
             oseries["z"] = oseries.loc[
@@ -182,33 +942,279 @@ class PastaStoreInterface:
             oseries.index.name = "name"
         return oseries
 
+    def _build_oseries_lookup(self):
+        oseries = self.oseries.sort_values("id")
+        return {
+            "name_to_id": pd.Series(oseries["id"].to_numpy(), index=oseries.index),
+            "name": oseries.index.to_numpy(),
+            "lat": oseries["lat"].to_numpy(dtype=float),
+            "lon": oseries["lon"].to_numpy(dtype=float),
+        }
+
+    @property
+    def oseries_lookup(self):
+        """Lookup arrays for oseries, built once per store version.
+
+        Contains a Series mapping oseries names to ids ('name_to_id'), and arrays
+        with the name, lat and lon of each oseries, indexed by id.
+        """
+        return self.get_cached(
+            "oseries_lookup", self._build_oseries_lookup, ["oseries"]
+        )
+
+    def get_spatial_index(self, libname, kind=None):
+        """Get spatial index of oseries or stresses, built once per store version.
+
+        Parameters
+        ----------
+        libname : str
+            name of the library, "oseries" or "stresses"
+        kind : str, optional
+            only index stresses of this kind, by default None
+
+        Returns
+        -------
+        SpatialIndex
+            spatial index of the time series locations
+        """
+
+        def build():
+            df = self.oseries if libname == "oseries" else self.stresses
+            if kind is not None:
+                df = df.loc[df["kind"] == kind]
+            return SpatialIndex(
+                df, x=self.column_mapping["x"], y=self.column_mapping["y"]
+            )
+
+        return self.get_cached(f"spatial_index_{libname}_{kind}", build, [libname])
+
+    def query_bbox(self, libname, bounds):
+        """Get names of oseries or stresses within bounding box.
+
+        Parameters
+        ----------
+        libname : str
+            name of the library, "oseries" or "stresses"
+        bounds : tuple of float
+            lon_min, lat_min, lon_max, lat_max
+
+        Returns
+        -------
+        list of str
+            names of the time series within the bounding box
+        """
+        return self.get_spatial_index(libname).query_bbox(bounds).tolist()
+
+    def query_polygon(self, libname, coordinates):
+        """Get names of oseries or stresses within polygon.
+
+        Parameters
+        ----------
+        libname : str
+            name of the library, "oseries" or "stresses"
+        coordinates : list of (lon, lat)
+            vertices of the polygon
+
+        Returns
+        -------
+        list of str
+            names of the time series within the polygon
+        """
+        return self.get_spatial_index(libname).query_polygon(coordinates).tolist()
+
+    def get_nearest_stresses(self, name, k=1, kind=None, max_distance=np.inf):
+        """Get nearest stresses to an oseries.
+
+        Parameters
+        ----------
+        name : str
+            name of the oseries
+        k : int, optional
+            number of stresses, by default 1
+        kind : str, optional
+            only consider stresses of this kind, by default None
+        max_distance : float, optional
+            only return stresses within this distance, by default inf
+
+        Returns
+        -------
+        pandas.Series
+            distance to the nearest stresses, indexed by name and sorted by
+            distance
+        """
+        x, y = self.oseries.loc[
+            name, [self.column_mapping["x"], self.column_mapping["y"]]
+        ]
+        return self.get_spatial_index("stresses", kind=kind).nearest(
+            x, y, k=k, max_distance=max_distance
+        )
+
+    def get_oseries_ids(self, names):
+        """Get ids of oseries, i.e. the point numbers in the oseries map trace.
+
+        Parameters
+        ----------
+        names : list of str
+            names of oseries
+
+        Returns
+        -------
+        numpy.ndarray
+            ids of oseries
+        """
+        return self.oseries_lookup["name_to_id"].loc[names].to_numpy()
+
+    def get_map_selection(self, ids, curve_number=0, trace_ids=None):
+        """Get selectedData for oseries map trace.
+
+        Points are identified by the name of the oseries in 'customdata' and
+        'text'. The point number is the position of the oseries in the trace.
+
+        Parameters
+        ----------
+        ids : list of int
+            ids of the selected oseries
+        curve_number : int, optional
+            number of the oseries trace in the map, by default 0
+        trace_ids : list of int, optional
+            ids of the oseries drawn in the trace, in the order they are drawn, by
+            default None, which means all oseries are drawn in order of their id.
+            Selected oseries that are not drawn, e.g. because they are clustered,
+            are included without point number.
+
+        Returns
+        -------
+        dict
+            selectedData dictionary, containing a list of selected points
+        """
+        lookup = self.oseries_lookup
+        ids = np.asarray(ids, dtype=int)
+        if trace_ids is None:
+            numbers = ids
+        else:
+            numbers = pd.Index(trace_ids).get_indexer(ids)
+        points = []
+        for i, lon, lat, name in zip(
+            numbers.tolist(),
+            lookup["lon"][ids].tolist(),
+            lookup["lat"][ids].tolist(),
+            lookup["name"][ids].tolist(),
+            strict=True,
+        ):
+            point = {"curveNumber": curve_number}
+            if i >= 0:
+                point["pointNumber"] = i
+                point["pointIndex"] = i
+            point.update({"lon": lon, "lat": lat, "text": name, "customdata": name})
+            points.append(point)
+        return {"points": points}
+
     @property
     def stresses(self):
+        """Stresses metadata, including lat/lon.
+
+        The frame is built once per store version. A shallow copy is returned, so
+        callers can add columns, but should not modify values in place.
+        """
+        stresses = self.get_cached("stresses", self._build_stresses, ["stresses"])
+        return stresses.copy(deep=False)
+
+    def _build_stresses(self):
         stresses = self.pstore.stresses.copy()
         if not stresses.empty:
             stresses["id"] = np.arange(stresses.index.size)
-            if (
-                self.column_mapping["lat"] not in stresses.columns
-                or self.column_mapping["lon"] not in stresses.columns
-            ):
-                stresses = add_latlon_to_dataframe(
-                    stresses,
-                    crs_from=self.crs,
-                    x_col=self.column_mapping["x"],
-                    y_col=self.column_mapping["y"],
-                )
+            stresses = self._add_latlon(stresses)
         else:
             stresses = pd.DataFrame(columns=["kind", "x", "y", "lat", "lon", "id"])
             stresses.index.name = "name"
         return stresses
 
     @property
-    @functools.lru_cache  # noqa: B019
+    def model_parameters(self):
+        """Optimal parameter values and standard errors for all models.
+
+        Read from the persistent parameter catalog, which is only updated for
+        models that were modified since the catalog was last updated.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame indexed by model name, containing parameter, optimal and
+            stderr columns, with one row per model parameter.
+        """
+        self._param_catalog.update()
+        return self._param_catalog.get()
+
+    @property
+    def model_results(self):
+        """Parameters and metrics for all models.
+
+        Read from the persistent results matrix, which is only updated for
+        models that were modified since it was last updated.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame indexed by model name, with one column per value, named
+            "<type>:<name>", e.g. "metric:rsq".
+        """
+        self._results.update()
+        return self._results.get()
+
+    def get_model_result(self, value):
+        """Get a single value for all models.
+
+        Parameters and metrics are read from the results matrix, signatures are
+        read from the signature index and assigned to the models of each oseries.
+        Signatures are never computed here: if signatures are missing or
+        outdated, the `signature_engine` is started in the background and the
+        signatures computed so far are returned. Use `signatures_pending` to
+        check whether the signatures are complete.
+
+        Parameters
+        ----------
+        value : str
+            name of the value, "<type>:<name>", e.g. "metric:rsq"
+
+        Returns
+        -------
+        pandas.Series
+            value for each model, NaN if the value could not be computed
+        """
+        value_type, v = value.split(":")
+        if value_type == "signature":
+            if self.signatures_pending():
+                self.signature_engine.start()
+            signature = self._signatures.get_column(v)
+            model_oseries = pd.Series(
+                {ml: o for o, models in self.oseries_models.items() for ml in models},
+                dtype=object,
+            )
+            return pd.Series(
+                signature.reindex(model_oseries.values).values,
+                index=pd.Index(model_oseries.index, name="name"),
+                name=value,
+            )
+        self._results.update()
+        return self._results.get_column(value)
+
+    def signatures_pending(self):
+        """Check whether signatures are being or must be computed.
+
+        The PastaStore is not read, which oseries must be computed is determined
+        by the `signature_engine` in the background.
+
+        Returns
+        -------
+        bool
+            True if the signature computation is running, or oseries may have
+            been added or modified since the last computation
+        """
+        return self.signature_engine.needs_update()
+
+    @property
     def unique_parameters(self):
-        param_set = set()
-        for mldict in self.pstore.get_models(None, return_dict=True):
-            param_set |= set(mldict["parameters"].index)
-        return list(param_set)
+        return self.model_parameters["parameter"].unique().tolist()
 
     @property
     def timeseries(self):
@@ -0,0 +1,125 @@
+import json
+import threading
+import zlib
+from collections import OrderedDict
+
+import plotly.io as pio
+
+
+def compress_figure(fig):
+    """Serialize plotly figure to compressed JSON.
+
+    Numeric arrays are stored as base64 typed arrays by plotly, the JSON is
+    compressed with zlib.
+
+    Parameters
+    ----------
+    fig : plotly.graph_objects.Figure or dict
+        figure to serialize
+
+    Returns
+    -------
+    bytes
+        compressed figure
+    """
+    return zlib.compress(pio.to_json(fig, validate=False).encode(), 1)
+
+
+def decompress_figure(data):
+    """Deserialize compressed figure, see `compress_figure`.
+
+    Parameters
+    ----------
+    data : bytes
+        compressed figure
+
+    Returns
+    -------
+    dict
+        figure as dictionary, which can be passed to dcc.Graph directly
+    """
+    return json.loads(zlib.decompress(data))
+
+
+class FigureCache:
+    """Least-recently-used cache of plotly figures, bounded by memory use.
+
+    Figures are stored compressed, see `compress_figure`, and are identified by
+    the name of the model, the kind of figure and a key that changes when the
+    figure changes, e.g. the fingerprint of the model and the plot options.
+
+    Parameters
+    ----------
+    maxbytes : int
+        memory budget in bytes, least-recently-used figures are evicted when the
+        size of all cached figures exceeds this budget.
+    """
+
+    def __init__(self, maxbytes):
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, name, kind, key):
+        """Get figure from cache, returns None if figure is not cached."""
+        with self._lock:
+            data = self._figures.get((name, kind, key))
+            if data is None:
+                self.misses += 1
+                return None
+            self._figures.move_to_end((name, kind, key))
+            self.hits += 1
+        return decompress_figure(data)
+
+    def put(self, name, kind, key, fig):
+        """Add figure to cache, evicting least-recently-used figures if needed."""
+        data = compress_figure(fig)
+        if len(data) > self.maxbytes:
+            return
+        with self._lock:
+            if (name, kind, key) in self._figures:
+                self._nbytes -= len(self._figures.pop((name, kind, key)))
+            self._figures[(name, kind, key)] = data
+            self._nbytes += len(data)
+            while self._nbytes > self.maxbytes:
+                _, evicted = self._figures.popitem(last=False)
+                self._nbytes -= len(evicted)
+
+    def evict(self, names=None):
+        """Remove figures from cache.
+
+        Parameters
+        ----------
+        names : list of str, optional
+            names of models for which to remove figures, by default None, which
+            clears the cache.
+        """
+        with self._lock:
+            if names is None:
+                self._figures.clear()
+                self._nbytes = 0
+                return
+            names = set(names)
+            for k in [k for k in self._figures if k[0] in names]:
+                self._nbytes -= len(self._figures.pop(k))
+
+    def info(self):
+        """Get cache statistics.
+
+        Returns
+        -------
+        dict
+            dictionary containing hits, misses, number of cached figures, and
+            size and memory budget in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._figures),
+                "nbytes": self._nbytes,
+                "maxbytes": self.maxbytes,
+            }
@@ -0,0 +1,634 @@
+import hashlib
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pastas as ps
+
+from pastasdash.application.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_store_cache_dir(pstore):
+    """Get directory for storing index files belonging to a PastaStore.
+
+    Parameters
+    ----------
+    pstore : pastastore.PastaStore
+        PastaStore object
+
+    Returns
+    -------
+    Path
+        path to cache directory for this PastaStore
+    """
+    conn = pstore.conn
+    location = getattr(conn, "path", None) or getattr(conn, "uri", None) or ""
+    key = f"{conn.conn_type}:{location}:{conn.name}".encode()
+    digest = hashlib.sha1(key).hexdigest()[:10]
+    return Path(settings["CACHE_DIR"]) / "index" / f"{conn.name}_{digest}"
+
+
+def get_item_fingerprint(pstore, libname, name):
+    """Get fingerprint of stored item content.
+
+    The fingerprint is derived as cheaply as possible for each connector type,
+    without deserializing the item where this can be avoided.
+
+    Parameters
+    ----------
+    pstore : pastastore.PastaStore
+        PastaStore object
+    libname : str
+        name of the library, "oseries", "stresses" or "models"
+    name : str
+        name of the item
+
+    Returns
+    -------
+    str
+        fingerprint that changes when the stored item changes
+    """
+    conn = pstore.conn
+    lib = conn._get_library(libname)
+    if conn.conn_type == "pas":
+        stat = (Path(lib) / f"{name}.pas").stat()
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    elif conn.conn_type == "arcticdb":
+        return str(lib.read_metadata(name).version)
+    elif conn.conn_type == "dict":
+        item = lib[name] if libname == "models" else lib[name][1]
+    else:
+        item = conn._get_item(libname, name)
+    if libname == "models":
+        # parameters and settings identify a solved model
+        content = item["parameters"].to_json() + str(item["settings"])
+        return hashlib.sha1(content.encode()).hexdigest()
+    return str(pd.util.hash_pandas_object(item).sum())
+
+
+def get_library_fingerprints(pstore, libname, names=None):
+    """Get fingerprints of items in a library, see `get_item_fingerprint`.
+
+    Parameters
+    ----------
+    pstore : pastastore.PastaStore
+        PastaStore object
+    libname : str
+        name of the library, "oseries", "stresses" or "models"
+    names : list of str, optional
+        names of the items, by default None, which uses all items in the library.
+
+    Returns
+    -------
+    pandas.Series
+        fingerprints, indexed by item name
+    """
+    if names is None:
+        names = pstore.conn._list_symbols(libname)
+    return pd.Series(
+        [get_item_fingerprint(pstore, libname, n) for n in names],
+        index=pd.Index(names, name="name"),
+        dtype=object,
+    )
+
+
+def get_library_markers(pstore, libname):
+    """Get markers of all items in a library that change when an item changes.
+
+    Unlike `get_library_fingerprints`, the items are not read. The markers are
+    listed in bulk: the modification time and size of the files of the pas
+    connector, including the metadata files, and the latest versions of the
+    ArcticDB connector. Other connectors are not supported, the dict connector
+    can only be modified by the process that holds it.
+
+    Parameters
+    ----------
+    pstore : pastastore.PastaStore
+        PastaStore object
+    libname : str
+        name of the library, "oseries", "stresses" or "models"
+
+    Returns
+    -------
+    pandas.Series or None
+        markers, indexed by item name, None if the connector is not supported
+    """
+    conn = pstore.conn
+    if conn.conn_type == "pas":
+        stats = {}
+        with os.scandir(conn._get_library(libname)) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".pas"):
+                    continue
+                stat = entry.stat()
+                name = entry.name.removesuffix(".pas")
+                if name.endswith("_meta"):
+                    name = name.removesuffix("_meta")
+                stats.setdefault(name, []).append(f"{stat.st_mtime_ns}-{stat.st_size}")
+        markers = {name: "-".join(sorted(s)) for name, s in stats.items()}
+    elif conn.conn_type == "arcticdb":
+        versions = conn._get_library(libname).list_versions(
+            latest_only=True, skip_snapshots=True
+        )
+        markers = {v.symbol: str(v.version) for v in versions}
+    else:
+        return None
+    return pd.Series(markers, index=pd.Index(list(markers), name="name"), dtype=object)
+
+
+def get_model_links(oseries_models, stresses_models):
+    """Get the time series used by each model.
+
+    Parameters
+    ----------
+    oseries_models : dict
+        names of the models of each oseries
+    stresses_models : dict
+        names of the models of each stress
+
+    Returns
+    -------
+    dict
+        list of (libname, name) of the time series used by each model
+    """
+    links = {}
+    for libname, lib_links in [
+        ("oseries", oseries_models),
+        ("stresses", stresses_models),
+    ]:
+        for name, models in lib_links.items():
+            for ml in models:
+                links.setdefault(ml, []).append((libname, name))
+    return links
+
+
+def get_model_fingerprints(pstore, names, links=None):
+    """Get fingerprints of models, including the time series they use.
+
+    Models are loaded with the stored oseries and stresses, so results derived
+    from a model change when one of its time series changes. The fingerprint of
+    a model combines the fingerprints of the model, its oseries and its
+    stresses.
+
+    Parameters
+    ----------
+    pstore : pastastore.PastaStore
+        PastaStore object
+    names : list of str
+        names of the models
+    links : dict, optional
+        time series used by each model, see `get_model_links`, by default None,
+        which uses the links maintained by pastastore.
+
+    Returns
+    -------
+    pandas.Series
+        fingerprints, indexed by model name
+    """
+    if links is None:
+        links = get_model_links(pstore.conn.oseries_models, pstore.conn.stresses_models)
+    fingerprints = get_library_fingerprints(pstore, "models", names)
+    # time series are often shared by models, so only compute fingerprints once
+    known = {}
+    for name in names:
+        for item in sorted(links.get(name, [])):
+            if item not in known:
+                known[item] = get_item_fingerprint(pstore, *item)
+            fingerprints.loc[name] += f"-{known[item]}"
+    return fingerprints
+
+
+class PersistentIndex(ABC):
+    """Persistent index of data derived from items in a PastaStore library.
+
+    Each row in the index belongs to an item in the library, and stores the
+    fingerprint of that item. Rows are only recomputed for items whose fingerprint
+    changed. After the initial check, only items that are marked as dirty are
+    checked again. Items written by other processes are marked as dirty by
+    `PastaStoreInterface.refresh`, which checks the PastaStore for changes in a
+    background thread.
+
+    Parameters
+    ----------
+    pstore : pastastore.PastaStore
+        PastaStore object
+    func : callable
+        function that computes the data for a single item, must accept name and
+        pstore as arguments.
+    libname : str
+        name of the library
+    path : Path, optional
+        path to the index file, by default None, which uses the cache directory
+        for the PastaStore.
+    """
+
+    columns = []
+    fname = None
+
+    def __init__(self, pstore, func, libname, path=None):
+        self.pstore = pstore
+        self.func = func
+        self.libname = libname
+        if path is None:
+            path = get_store_cache_dir(pstore) / self.fname.format(libname=libname)
+        self.path = Path(path)
+        self._index = self._read()
+        self._dirty = None
+        # guards _index and _dirty, which are used by request threads and
+        # background computations
+        self._lock = threading.RLock()
+        # only one thread updates the index at a time
+        self._update_lock = threading.Lock()
+
+    def _read(self):
+        if self.path.exists():
+            try:
+                return pd.read_parquet(self.path)
+            except Exception as e:
+                logger.warning("Could not read index %s: %s", self.path, e)
+        index = pd.DataFrame(columns=self.columns + ["fingerprint"])
+        index.index.name = "name"
+        return index
+
+    def _write(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._index.to_parquet(self.path)
+        except Exception as e:
+            logger.warning("Could not write index %s: %s", self.path, e)
+
+    @abstractmethod
+    def _compute(self, names):
+        """Compute index rows for items, indexed by item name."""
+
+    def _set_dtypes(self, index):
+        return index
+
+    def _get_fingerprints(self, names):
+        """Get fingerprints of items, indexed by item name."""
+        return get_library_fingerprints(self.pstore, self.libname, names)
+
+    def mark_dirty(self, names=None):
+        """Mark items as modified.
+
+        Parameters
+        ----------
+        names : list of str, optional
+            names of modified items, by default None, which marks all items as
+            (possibly) modified.
+        """
+        with self._lock:
+            if names is None:
+                self._dirty = None
+            elif self._dirty is not None:
+                self._dirty.update(names)
+
+    def clear(self):
+        """Remove all rows, so all items are recomputed on the next update."""
+        with self._lock:
+            self._index = self._index.iloc[:0]
+            self._dirty = None
+
+    def get_stale(self, consume=True):
+        """Get items that changed since the last update.
+
+        On the first call, the fingerprints of all items are compared to those
+        stored in the index. Afterwards only items marked as dirty are checked.
+
+        Parameters
+        ----------
+        consume : bool, optional
+            if True, the checked items are no longer marked as dirty, items that
+            are not recomputed by the caller must be marked as dirty again. By
+            default True.
+
+        Returns
+        -------
+        stale : pandas.Series
+            fingerprints of items that must be recomputed, indexed by name
+        removed : pandas.Index
+            names of items that were removed from the library
+        """
+        with self._lock:
+            dirty = None if self._dirty is None else set(self._dirty)
+            if consume:
+                self._dirty = set()
+            indexed = self._index.index.unique()
+        try:
+            conn = self.pstore.conn
+            if dirty is None:
+                all_names = conn._list_symbols(self.libname)
+                check = all_names
+                removed = indexed.difference(all_names)
+            else:
+                check = [n for n in dirty if conn._item_exists(self.libname, n)]
+                removed = indexed.intersection(dirty.difference(check))
+            fingerprints = self._get_fingerprints(check)
+        except Exception:
+            if consume:
+                self.mark_dirty(dirty)
+            raise
+
+        with self._lock:
+            known = self._index.groupby(level=0)["fingerprint"].first()
+        known = known.reindex(fingerprints.index)
+        return fingerprints.loc[known.ne(fingerprints)], removed
+
+    def is_dirty(self):
+        """Check whether items may have changed since the last update.
+
+        Unlike `needs_update`, the library is not read: all items may have
+        changed before the first update, afterwards only items that are marked
+        as dirty.
+
+        Returns
+        -------
+        bool
+            True if items must be checked
+        """
+        with self._lock:
+            return self._dirty is None or len(self._dirty) > 0
+
+    def needs_update(self):
+        """Check whether any items changed since the last update.
+
+        Items are not marked as checked, so this can be called while the index
+        is being updated.
+
+        Returns
+        -------
+        bool
+            True if rows must be added, recomputed or removed
+        """
+        stale, removed = self.get_stale(consume=False)
+        return not (stale.empty and removed.empty)
+
+    def insert(self, rows, fingerprints, removed=None):
+        """Insert computed rows into the index and write it to disk.
+
+        Existing rows of the same items are replaced.
+
+        Parameters
+        ----------
+        rows : pandas.DataFrame
+            computed rows, indexed by item name
+        fingerprints : pandas.Series
+            fingerprints of the items, indexed by item name
+        removed : list of str, optional
+            names of items to remove from the index
+        """
+        drop = rows.index.unique()
+        if removed is not None:
+            drop = drop.union(removed)
+        if not rows.empty:
+            rows = rows.copy()
+            rows["fingerprint"] = fingerprints.loc[rows.index].values
+        with self._lock:
+            index = self._index.loc[~self._index.index.isin(drop)]
+            if not rows.empty:
+                index = pd.concat([index, rows]) if not index.empty else rows
+            index = self._set_dtypes(index)
+            index["fingerprint"] = index["fingerprint"].astype(str)
+            index.index.name = "name"
+            self._index = index
+            self._write()
+
+    def update(self):
+        """Recompute index rows for items that changed.
+
+        Concurrent calls wait for the running update, so the index contains all
+        items once this returns.
+        """
+        with self._update_lock:
+            stale, removed = self.get_stale()
+            if stale.empty and removed.empty:
+                return
+
+            try:
+                if stale.empty:
+                    with self._lock:
+                        rows = self._index.iloc[:0].drop(columns="fingerprint")
+                else:
+                    logger.info("Updating %s for %d items.", self.path.stem, stale.size)
+                    rows = self._compute(stale.index.tolist())
+            except Exception:
+                self.mark_dirty(stale.index.union(removed))
+                raise
+            self.insert(rows, stale, removed=removed)
+
+    def get(self, names=None):
+        """Get index rows.
+
+        Parameters
+        ----------
+        names : list of str, optional
+            names of items, by default None, which returns all.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame containing index data
+        """
+        with self._lock:
+            index = self._index
+        if names is None:
+            return index.loc[:, self.columns]
+        return index.loc[index.index.isin(names), self.columns]
+
+
+class TimeSeriesStatsIndex(PersistentIndex):
+    """Persistent index of time series statistics.
+
+    Stores tmin, tmax and the number of observations for each time series.
+    """
+
+    columns = ["tmin", "tmax", "n_observations"]
+    fname = "{libname}_stats.parquet"
+
+    def __init__(self, pstore, func, libname="oseries", path=None):
+        super().__init__(pstore, func, libname=libname, path=path)
+
+    def _compute(self, names):
+        stats = self.pstore.apply(
+            self.libname,
+            self.func,
+            names=names,
+            kwargs={"pstore": self.pstore},
+            parallel=settings["PARALLEL"],
+            fancy_output=False,
+        )
+        return pd.concat(stats, axis=1).T.loc[:, self.columns]
+
+    def _set_dtypes(self, index):
+        index["tmin"] = pd.to_datetime(index["tmin"])
+        index["tmax"] = pd.to_datetime(index["tmax"])
+        index["n_observations"] = index["n_observations"].astype(int)
+        return index
+
+
+class ParameterCatalog(PersistentIndex):
+    """Persistent catalog of model parameters.
+
+    Stores the parameter names, optimal values and standard errors of each model,
+    with one row per model parameter.
+    """
+
+    columns = ["parameter", "optimal", "stderr"]
+    fname = "{libname}_parameters.parquet"
+
+    def __init__(self, pstore, func, libname="models", path=None):
+        super().__init__(pstore, func, libname=libname, path=path)
+
+    def _compute(self, names):
+        params = self.pstore.apply(
+            self.libname,
+            self.func,
+            names=names,
+            kwargs={"pstore": self.pstore},
+            parallel=settings["PARALLEL"],
+            fancy_output=False,
+        )
+        return pd.concat(params).loc[:, self.columns]
+
+    def _set_dtypes(self, index):
+        index["parameter"] = index["parameter"].astype(str)
+        index["optimal"] = index["optimal"].astype(float)
+        index["stderr"] = index["stderr"].astype(float)
+        return index
+
+
+class ResultsMatrix(PersistentIndex):
+    """Persistent matrix of model results.
+
+    Stores the optimal parameters and the metrics in
+    `pastas.modelstats.Statistics.ops` of each model, with one row per model and
+    one column per value. Columns are named "<type>:<name>", e.g.
+    "parameter:recharge_A" or "metric:rsq". Signatures only depend on the oseries
+    and are stored in the SignatureIndex.
+
+    The fingerprint of each row combines the fingerprints of the model and its
+    time series, see `get_model_fingerprints`.
+
+    Parameters
+    ----------
+    links : callable, optional
+        function without arguments that returns the time series used by each
+        model, see `get_model_links`, by default None, which uses the links
+        maintained by pastastore.
+    """
+
+    fname = "{libname}_results.parquet"
+
+    def __init__(self, pstore, func, libname="models", path=None, links=None):
+        super().__init__(pstore, func, libname=libname, path=path)
+        self.links = links
+
+    def _get_fingerprints(self, names):
+        links = None if self.links is None else self.links()
+        return get_model_fingerprints(self.pstore, names, links=links)
+
+    def _compute(self, names):
+        results = self.pstore.apply(
+            self.libname,
+            self.func,
+            names=names,
+            kwargs={"pstore": self.pstore},
+            parallel=settings["PARALLEL"],
+            fancy_output=False,
+        )
+        return pd.concat(results, axis=1).T
+
+    def _set_dtypes(self, index):
+        return index.astype({c: float for c in index.columns if c != "fingerprint"})
+
+    def get(self, names=None):
+        """Get results matrix.
+
+        Parameters
+        ----------
+        names : list of str, optional
+            names of models, by default None, which returns all.
+
+        Returns
+        -------
+        pandas.DataFrame
+            results matrix, indexed by model name
+        """
+        with self._lock:
+            index = self._index.drop(columns="fingerprint")
+        if names is None:
+            return index
+        return index.loc[index.index.isin(names)]
+
+    def get_column(self, column):
+        """Get a single column of the results matrix.
+
+        Parameters
+        ----------
+        column : str
+            name of the column, e.g. "metric:rsq"
+
+        Returns
+        -------
+        pandas.Series
+            values for all models, NaN if the value is not available
+        """
+        with self._lock:
+            index = self._index
+        if column in index.columns:
+            return index[column]
+        return pd.Series(np.nan, index=index.index, name=column)
+
+
+class SignatureIndex(PersistentIndex):
+    """Persistent index of groundwater signatures.
+
+    Stores the signatures in `pastas.stats.signatures.__all__` for each oseries,
+    with one column per signature. Usually filled by the SignatureEngine, which
+    computes the signatures on a process pool.
+    """
+
+    columns = list(ps.stats.signatures.__all__)
+    fname = "{libname}_signatures.parquet"
+
+    def __init__(self, pstore, func, libname="oseries", path=None):
+        super().__init__(pstore, func, libname=libname, path=path)
+
+    def _compute(self, names):
+        signatures = self.pstore.apply(
+            self.libname,
+            self.func,
+            names=names,
+            kwargs={"pstore": self.pstore},
+            parallel=settings["PARALLEL"],
+            fancy_output=False,
+        )
+        return pd.concat(signatures, axis=1).T.loc[:, self.columns]
+
+    def _set_dtypes(self, index):
+        return index.astype(dict.fromkeys(self.columns, float))
+
+    def get_column(self, column):
+        """Get a single signature for all oseries.
+
+        Parameters
+        ----------
+        column : str
+            name of the signature
+
+        Returns
+        -------
+        pandas.Series
+            signature for each oseries, NaN if it could not be computed
+        """
+        with self._lock:
+            index = self._index
+        if column in index.columns:
+            return index[column]
+        return pd.Series(np.nan, index=index.index, name=column)
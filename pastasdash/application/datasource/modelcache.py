@@ -0,0 +1,197 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+def estimate_model_nbytes(ml):
+    """Estimate memory footprint of a pastas Model.
+
+    The estimate is based on the size of the time series in the model, which
+    dominate the memory use. Both the original and the processed series are
+    counted.
+
+    Parameters
+    ----------
+    ml : pastas.Model
+        pastas Model
+
+    Returns
+    -------
+    int
+        estimated size in bytes
+    """
+    series = [ml.oseries.series_original]
+    for sm in ml.stressmodels.values():
+        # 'stresses' in pastas>=2.0, 'stress' in earlier versions
+        stresses = getattr(sm, "stresses", None) or getattr(sm, "stress", [])
+        series += [ts.series_original for ts in stresses]
+    return 2 * sum(s.memory_usage(index=True) for s in series)
+
+
+class ModelCache:
+    """Least-recently-used cache of pastas Models, bounded by memory use.
+
+    Models are identified by name and a key that changes when the stored model
+    changes, e.g. the fingerprint of the model. Only the last version of each
+    model is kept, a model cached with another key is not returned.
+
+    Parameters
+    ----------
+    maxbytes : int
+        memory budget in bytes, least-recently-used models are evicted when the
+        estimated size of all cached models exceeds this budget.
+    """
+
+    def __init__(self, maxbytes):
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self._models = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, name, key):
+        """Get model from cache, returns None if model is not cached."""
+        with self._lock:
+            item = self._models.get(name)
+            if item is not None and item[0] == key:
+                self._models.move_to_end(name)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+            return None
+
+    def put(self, name, key, ml):
+        """Add model to cache, evicting least-recently-used models if needed."""
+        nbytes = estimate_model_nbytes(ml)
+        if nbytes > self.maxbytes:
+            return
+        with self._lock:
+            if name in self._models:
+                self._nbytes -= self._models.pop(name)[2]
+            self._models[name] = (key, ml, nbytes)
+            self._nbytes += nbytes
+            while self._nbytes > self.maxbytes:
+                _, (_, _, evicted) = self._models.popitem(last=False)
+                self._nbytes -= evicted
+
+    def evict(self, names=None):
+        """Remove models from cache.
+
+        Parameters
+        ----------
+        names : list of str, optional
+            names of models to remove, by default None, which clears the cache.
+        """
+        with self._lock:
+            if names is None:
+                self._models.clear()
+                self._nbytes = 0
+                return
+            for name in names:
+                if name in self._models:
+                    self._nbytes -= self._models.pop(name)[2]
+
+    def info(self):
+        """Get cache statistics.
+
+        Returns
+        -------
+        dict
+            dictionary containing hits, misses, number of cached models, and
+            estimated size and memory budget in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._models),
+                "nbytes": self._nbytes,
+                "maxbytes": self.maxbytes,
+            }
+
+
+class ModelStagingArea:
+    """Per-session staging area for solved models that are not saved yet.
+
+    Models are kept on the server and identified by an opaque key, so only the
+    key has to be sent to the browser. Models are evicted when they have not
+    been accessed for `ttl` seconds, or when a session stages more than
+    `max_models_per_session` models.
+
+    Parameters
+    ----------
+    ttl : float
+        time in seconds after which an unused model is evicted
+    max_models_per_session : int, optional
+        maximum number of models staged per session, by default 4
+    """
+
+    def __init__(self, ttl, max_models_per_session=4):
+        self.ttl = ttl
+        self.max_models_per_session = max(int(max_models_per_session), 1)
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, session_id, ml):
+        """Stage a model for a session.
+
+        Parameters
+        ----------
+        session_id : str
+            identifier of the session
+        ml : pastas.Model
+            model to stage
+
+        Returns
+        -------
+        str
+            key of the staged model
+        """
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._evict_expired()
+            self._models[key] = (session_id, ml, time.monotonic())
+            keys = [k for k, v in self._models.items() if v[0] == session_id]
+            for k in keys[: -self.max_models_per_session]:
+                del self._models[k]
+        return key
+
+    def get(self, session_id, key):
+        """Get a staged model.
+
+        Parameters
+        ----------
+        session_id : str
+            identifier of the session
+        key : str
+            key of the staged model
+
+        Returns
+        -------
+        pastas.Model or None
+            staged model, None if the key is unknown, the model was evicted or
+            was staged by another session.
+        """
+        with self._lock:
+            self._evict_expired()
+            item = self._models.get(key)
+            if item is None or item[0] != session_id:
+                return None
+            self._models[key] = (session_id, item[1], time.monotonic())
+            self._models.move_to_end(key)
+            return item[1]
+
+    def _evict_expired(self):
+        # models are ordered by last access, so only the first ones can expire
+        now = time.monotonic()
+        while self._models:
+            key, (_, _, accessed) = next(iter(self._models.items()))
+            if now - accessed <= self.ttl:
+                break
+            del self._models[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._models)
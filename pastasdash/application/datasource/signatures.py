@@ -0,0 +1,262 @@
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+import pastas as ps
+
+from pastasdash.application.datasource.solver import get_mp_context, shutdown_pool
+
+logger = logging.getLogger(__name__)
+
+
+def compute_signatures(series, signatures=None):
+    """Compute groundwater signatures for time series.
+
+    Signatures that cannot be computed are set to NaN. This function is run in
+    worker processes, so it only depends on the time series that are passed in.
+
+    Parameters
+    ----------
+    series : dict of pandas.Series
+        time series, by name
+    signatures : list of str, optional
+        names of signatures, by default None, which computes all signatures in
+        `pastas.stats.signatures.__all__`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        signatures, indexed by name of the time series
+    """
+    if signatures is None:
+        signatures = ps.stats.signatures.__all__
+    results = {}
+    for name, s in series.items():
+        values = {}
+        for signature in signatures:
+            try:
+                values[signature] = getattr(ps.stats.signatures, signature)(s)
+            except Exception:
+                values[signature] = np.nan
+        results[name] = values
+    df = pd.DataFrame.from_dict(results, orient="index", columns=signatures)
+    df.index.name = "name"
+    return df.astype(float)
+
+
+class SignatureJob:
+    """State of a signature computation.
+
+    Parameters
+    ----------
+    job_id : str
+        identifier of the job
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.status = "running"
+        self.done = 0
+        self.total = 0
+        self.error = None
+        self.cancelled = threading.Event()
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "done": self.done,
+            "total": self.total,
+            "error": self.error,
+        }
+
+
+class SignatureEngine:
+    """Compute signatures for all oseries on a process pool.
+
+    The oseries that changed since the last computation are split in chunks,
+    which are read in a background thread and computed in worker processes. The
+    results of each chunk are written to the signature index as soon as they
+    are available, so a cancelled computation continues where it stopped on the
+    next run. Only a single computation runs at a time.
+
+    Parameters
+    ----------
+    index : SignatureIndex
+        persistent index storing the signatures
+    read : callable
+        function that reads the time series for a list of names
+    max_workers : int, optional
+        number of worker processes, by default None, which uses the number of
+        CPUs.
+    chunksize : int, optional
+        number of time series per chunk, by default 50
+    """
+
+    def __init__(self, index, read, max_workers=None, chunksize=50):
+        self.index = index
+        self.read = read
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = max(int(chunksize), 1)
+        self._jobs = {}
+        self._current = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        """Whether a computation is running."""
+        return self._current is not None and self._current.status == "running"
+
+    def needs_update(self):
+        """Check whether signatures must be computed for any oseries.
+
+        The library is not read, oseries that were modified since the last
+        computation are checked when the computation runs, see `start`.
+        """
+        return self.running or self.index.is_dirty()
+
+    def start(self):
+        """Start computing signatures in the background.
+
+        Returns
+        -------
+        str
+            identifier of the job, if a computation is already running, the
+            identifier of that job is returned.
+        """
+        with self._lock:
+            if self.running:
+                return self._current.job_id
+            job = self._new_job()
+            self._thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+            self._thread.start()
+        return job.job_id
+
+    def run(self):
+        """Compute signatures and wait until the computation is finished.
+
+        Returns
+        -------
+        dict
+            progress of the finished job
+        """
+        with self._lock:
+            thread = self._thread if self.running else None
+            if thread is None:
+                job = self._new_job()
+        if thread is not None:
+            thread.join()
+            return self._current.to_dict()
+        self._run(job)
+        return job.to_dict()
+
+    def progress(self, job_id):
+        """Get progress of a job.
+
+        Parameters
+        ----------
+        job_id : str
+            identifier of the job
+
+        Returns
+        -------
+        dict or None
+            dictionary containing the status ("running", "done", "cancelled" or
+            "failed"), the number of computed and total oseries and the error
+            message if the job failed, None if the job is unknown.
+        """
+        job = self._jobs.get(job_id)
+        return None if job is None else job.to_dict()
+
+    def cancel(self, job_id=None):
+        """Cancel a job.
+
+        Results of chunks that were already computed are kept.
+
+        Parameters
+        ----------
+        job_id : str, optional
+            identifier of the job, by default None, which cancels the running job
+        """
+        job = self._current if job_id is None else self._jobs.get(job_id)
+        if job is not None:
+            job.cancelled.set()
+
+    def _new_job(self):
+        job = SignatureJob(uuid.uuid4().hex)
+        # only keep the state of the last few jobs
+        for job_id in list(self._jobs)[:-9]:
+            del self._jobs[job_id]
+        self._jobs[job.job_id] = job
+        self._current = job
+        return job
+
+    def _run(self, job):
+        names = []
+        computed = set()
+        try:
+            stale, removed = self.index.get_stale()
+            names = stale.index.tolist()
+            job.total = len(names)
+            if not removed.empty:
+                self.index.insert(pd.DataFrame(), stale, removed=removed)
+            chunks = [
+                names[i : i + self.chunksize]
+                for i in range(0, len(names), self.chunksize)
+            ]
+            if len(chunks) <= 1 or self.max_workers == 1:
+                # not worth starting worker processes
+                for chunk in chunks:
+                    if job.cancelled.is_set():
+                        break
+                    series = dict(zip(chunk, self.read(chunk), strict=True))
+                    self.index.insert(compute_signatures(series), stale)
+                    computed.update(chunk)
+                    job.done += len(chunk)
+            else:
+                self._run_pool(job, chunks, stale, computed)
+            job.status = "cancelled" if job.cancelled.is_set() else "done"
+        except Exception as e:
+            logger.exception("Computing signatures failed.")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            remaining = [n for n in names if n not in computed]
+            if remaining:
+                self.index.mark_dirty(remaining)
+
+    def _run_pool(self, job, chunks, stale, computed):
+        chunks = iter(chunks)
+        pending = {}
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=get_mp_context()
+        )
+
+        def submit_next():
+            chunk = next(chunks, None)
+            if chunk is None or job.cancelled.is_set():
+                return
+            series = dict(zip(chunk, self.read(chunk), strict=True))
+            pending[pool.submit(compute_signatures, series)] = chunk
+
+        try:
+            # only submit a chunk per worker, so pending chunks are not queued in
+            # the pool and the number of series held in memory is limited
+            for _ in range(self.max_workers):
+                submit_next()
+            while pending and not job.cancelled.is_set():
+                finished, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    chunk = pending.pop(future)
+                    self.index.insert(future.result(), stale)
+                    computed.update(chunk)
+                    job.done += len(chunk)
+                    submit_next()
+        finally:
+            # chunks that are still being computed are discarded
+            shutdown_pool(pool, terminate=bool(pending))
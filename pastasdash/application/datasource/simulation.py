@@ -0,0 +1,144 @@
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def get_simulation_key(fingerprint, tmin=None, tmax=None, freq=None):
+    """Get key identifying a model simulation.
+
+    Parameters
+    ----------
+    fingerprint : str
+        fingerprint of the stored model and its time series, see
+        `get_model_fingerprints`
+    tmin : pd.Timestamp or str, optional
+        start of the simulation
+    tmax : pd.Timestamp or str, optional
+        end of the simulation
+    freq : str, optional
+        frequency of the simulation
+
+    Returns
+    -------
+    str
+        key for the simulation
+    """
+    tmin = None if tmin is None else pd.Timestamp(tmin).isoformat()
+    tmax = None if tmax is None else pd.Timestamp(tmax).isoformat()
+    key = f"{fingerprint}:{tmin}:{tmax}:{freq}".encode()
+    return hashlib.sha1(key).hexdigest()
+
+
+class SimulationCache:
+    """Persistent cache of simulated heads and contributions of stored models.
+
+    Each simulation is stored as a Parquet file containing the simulation and the
+    contributions of all stress models. The least-recently-used simulations are
+    removed when the size of the cache exceeds the disk budget.
+
+    Parameters
+    ----------
+    path : Path
+        directory for storing the simulations
+    maxbytes : int, optional
+        disk budget in bytes, by default None, which does not limit the size of
+        the cache.
+    """
+
+    def __init__(self, path, maxbytes=None):
+        self.path = Path(path)
+        self.maxbytes = maxbytes
+        self._nbytes = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _prefix(name):
+        return hashlib.sha1(name.encode()).hexdigest()[:16]
+
+    def _fname(self, name, key):
+        return self.path / f"{self._prefix(name)}_{key}.parquet"
+
+    def get(self, name, key):
+        """Get cached simulation, returns None if simulation is not cached."""
+        fname = self._fname(name, key)
+        if fname.exists():
+            try:
+                df = pd.read_parquet(fname)
+                # modification time is used to find least-recently-used files
+                os.utime(fname)
+                return df
+            except Exception as e:
+                logger.warning("Could not read simulation %s: %s", fname, e)
+        return None
+
+    def put(self, name, key, df):
+        """Store simulation in cache."""
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            fname = self._fname(name, key)
+            df.to_parquet(fname)
+            self._prune(fname.stat().st_size)
+        except Exception as e:
+            logger.warning("Could not write simulation for %s: %s", name, e)
+
+    def _scan(self):
+        files = []
+        for fname in self.path.glob("*.parquet"):
+            try:
+                stat = fname.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, fname))
+        return files
+
+    def _prune(self, added):
+        """Remove least-recently-used simulations if the disk budget is exceeded.
+
+        The cache is pruned to 90% of the budget, so it is not scanned on every
+        write once it is full.
+        """
+        if self.maxbytes is None:
+            return
+        with self._lock:
+            if self._nbytes is None:
+                self._nbytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._nbytes += added
+            if self._nbytes <= self.maxbytes:
+                return
+            files = sorted(self._scan())
+            nbytes = sum(size for _, size, _ in files)
+            for _, size, fname in files:
+                if nbytes <= 0.9 * self.maxbytes:
+                    break
+                fname.unlink(missing_ok=True)
+                nbytes -= size
+            self._nbytes = nbytes
+
+    def evict(self, names=None):
+        """Remove cached simulations.
+
+        Parameters
+        ----------
+        names : list of str, optional
+            names of models for which to remove simulations, by default None,
+            which removes all simulations.
+        """
+        if not self.path.exists():
+            return
+        patterns = (
+            ["*.parquet"]
+            if names is None
+            else [f"{self._prefix(n)}_*.parquet" for n in names]
+        )
+        for pattern in patterns:
+            for fname in self.path.glob(pattern):
+                fname.unlink(missing_ok=True)
+        with self._lock:
+            self._nbytes = None
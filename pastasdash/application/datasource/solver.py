@@ -0,0 +1,699 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor
+from concurrent.futures import wait as wait_futures
+from functools import partial
+from multiprocessing.connection import wait
+
+import pastas as ps
+
+logger = logging.getLogger(__name__)
+
+
+def get_mp_context():
+    """Get multiprocessing context for worker processes.
+
+    Uses forkserver where available, which starts processes quickly without
+    forking the threads of the web server, and spawn otherwise.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["pastas"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def shutdown_pool(pool, terminate=False):
+    """Shut down a process pool and wait for its worker processes to exit.
+
+    Parameters
+    ----------
+    pool : concurrent.futures.ProcessPoolExecutor
+        pool to shut down
+    terminate : bool, optional
+        terminate the worker processes, discarding the tasks they are working
+        on, by default False, which waits for running tasks to finish.
+    """
+    # copy the processes, the pool forgets them when shutting down
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if terminate:
+            process.terminate()
+        process.join()
+
+
+def can_warm_start(ml):
+    """Check whether a model can be solved starting from its optimal parameters.
+
+    This is the case when the model was solved before with a noise model, and
+    the parameters of the model components did not change since then.
+
+    Parameters
+    ----------
+    ml : pastas.Model
+        model to check
+
+    Returns
+    -------
+    bool
+        True if the model can be warm-started
+    """
+    if not isinstance(ml.noisemodel, ps.ArNoiseModel):
+        return False
+    p = ml.parameters
+    if not ml.get_init_parameters(initial=True).index.equals(p.index):
+        return False
+    optimal = p.loc[p["vary"].astype(bool), "optimal"]
+    if optimal.isna().any():
+        return False
+    # starting values must lie within the bounds for the solver
+    pmin = p.loc[optimal.index, "pmin"].astype(float).fillna(-float("inf"))
+    pmax = p.loc[optimal.index, "pmax"].astype(float).fillna(float("inf"))
+    return bool(optimal.between(pmin, pmax).all())
+
+
+def solve_model(ml, tmin=None, tmax=None, warm_start=False):
+    """Solve a model, add a noise model and solve again.
+
+    Parameters
+    ----------
+    ml : pastas.Model
+        model to solve, modified in place
+    tmin : pandas.Timestamp, optional
+        start of the calibration period
+    tmax : pandas.Timestamp, optional
+        end of the calibration period
+    warm_start : bool, optional
+        if True and the model can be warm-started (see `can_warm_start`), the
+        model is solved once with the noise model, starting from the optimal
+        parameters of the previous solve. Otherwise the model is solved from
+        the initial parameters in two passes. By default False.
+
+    Returns
+    -------
+    pastas.Model
+        solved model
+    """
+    if warm_start and can_warm_start(ml):
+        ml.solve(freq="D", tmin=tmin, tmax=tmax, report=False, initial=False)
+        return ml
+    ml.solve(tmin=tmin, tmax=tmax, report=False)
+    ml.add_noisemodel(ps.ArNoiseModel())
+    ml.solve(freq="D", tmin=tmin, tmax=tmax, report=False, initial=False)
+    return ml
+
+
+def solve_models(models, tmin=None, tmax=None, func=solve_model):
+    """Solve multiple models, recording the time and errors for each model.
+
+    Parameters
+    ----------
+    models : dict of pastas.Model
+        models to solve, by name
+    tmin : pandas.Timestamp, optional
+        start of the calibration period
+    tmax : pandas.Timestamp, optional
+        end of the calibration period
+    func : callable, optional
+        function that solves a model, by default solve_model
+
+    Returns
+    -------
+    list of tuple
+        name, solved model (None if solving failed), solve time in seconds and
+        error message (None if solving succeeded) for each model
+    """
+    results = []
+    for name, ml in models.items():
+        start = time.perf_counter()
+        try:
+            ml = func(ml, tmin=tmin, tmax=tmax)
+            error = None
+        except Exception as e:
+            ml = None
+            error = f"{type(e).__name__}: {e}"
+        results.append((name, ml, time.perf_counter() - start, error))
+    return results
+
+
+def _run_job(conn, func, args, kwargs):
+    """Run job in worker process and send result to parent."""
+    try:
+        result = ("done", func(*args, **kwargs))
+    except Exception as e:
+        result = ("failed", f"{type(e).__name__}: {e}")
+    try:
+        conn.send(result)
+    finally:
+        conn.close()
+
+
+class QueueFullError(Exception):
+    """Raised when a user already has the maximum number of jobs queued."""
+
+
+class SolveJob:
+    """State of a solve job.
+
+    Parameters
+    ----------
+    job_id : str
+        identifier of the job
+    owner : str
+        identifier of the user that submitted the job
+    name : str
+        name of the model
+    func : callable
+        function that is run in the worker process
+    args : tuple
+        positional arguments for func
+    kwargs : dict
+        keyword arguments for func
+    """
+
+    def __init__(self, job_id, owner, name, func, args, kwargs):
+        self.job_id = job_id
+        self.owner = owner
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.status = "queued"
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.last_seen = self.submitted
+        self.result = None
+        self.error = None
+        self.process = None
+        self.conn = None
+
+    @property
+    def active(self):
+        return self.status in ["queued", "running"]
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+
+class SolveQueue:
+    """Queue for solving models in worker processes.
+
+    Jobs are run in separate processes, at most `max_workers` at a time, so
+    solving models does not block the web server and running jobs can be
+    cancelled. Each user can have at most `max_jobs_per_user` jobs queued or
+    running. Jobs whose status is not requested for `abandon_timeout` seconds,
+    e.g. because the browser tab was closed, are cancelled.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        maximum number of jobs that run simultaneously, by default 2
+    max_jobs_per_user : int, optional
+        maximum number of queued or running jobs per user, by default 2
+    abandon_timeout : float, optional
+        cancel jobs that are not polled for this number of seconds, by default
+        30. Set to 0 to never cancel jobs.
+    """
+
+    def __init__(self, max_workers=2, max_jobs_per_user=2, abandon_timeout=30):
+        self.max_workers = max(int(max_workers), 1)
+        self.max_jobs_per_user = max_jobs_per_user
+        self.abandon_timeout = abandon_timeout
+        self._jobs = {}
+        self._queue = deque()
+        self._running = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._dispatcher = None
+        self._ctx = None
+
+    def submit(self, owner, name, ml, tmin=None, tmax=None, func=solve_model):
+        """Submit a model to be solved.
+
+        Parameters
+        ----------
+        owner : str
+            identifier of the user submitting the job
+        name : str
+            name of the model
+        ml : pastas.Model
+            model to solve, a copy is sent to the worker process
+        tmin : pandas.Timestamp, optional
+            start of the calibration period
+        tmax : pandas.Timestamp, optional
+            end of the calibration period
+        func : callable, optional
+            function that solves the model, by default solve_model
+
+        Returns
+        -------
+        str
+            identifier of the job
+
+        Raises
+        ------
+        QueueFullError
+            if the user already has the maximum number of jobs
+        """
+        with self._lock:
+            n_active = sum(
+                job.active for job in self._jobs.values() if job.owner == owner
+            )
+            if self.max_jobs_per_user and n_active >= self.max_jobs_per_user:
+                raise QueueFullError(
+                    f"Maximum number of solve jobs ({self.max_jobs_per_user}) "
+                    "reached, wait for a job to finish or cancel it."
+                )
+            job = SolveJob(
+                uuid.uuid4().hex,
+                owner,
+                name,
+                func,
+                (ml,),
+                {"tmin": tmin, "tmax": tmax},
+            )
+            self._jobs[job.job_id] = job
+            self._queue.append(job)
+            self._ensure_dispatcher()
+        self._wakeup.set()
+        return job.job_id
+
+    def status(self, job_id):
+        """Get status of a job.
+
+        Requesting the status marks the job as in use, so it is not cancelled as
+        abandoned.
+
+        Parameters
+        ----------
+        job_id : str
+            identifier of the job
+
+        Returns
+        -------
+        dict or None
+            dictionary containing the name of the model, the status ("queued",
+            "running", "done", "failed" or "cancelled"), the position in the
+            queue, the elapsed time in seconds and the error message if the job
+            failed. None if the job is unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.last_seen = time.monotonic()
+            position = (
+                [j.job_id for j in self._queue].index(job_id) + 1
+                if job.status == "queued"
+                else 0
+            )
+            return {
+                "job_id": job.job_id,
+                "name": job.name,
+                "status": job.status,
+                "position": position,
+                "elapsed": job.elapsed(),
+                "error": job.error,
+            }
+
+    def pop_result(self, job_id):
+        """Get the result of a finished job and remove the job from the queue.
+
+        Parameters
+        ----------
+        job_id : str
+            identifier of the job
+
+        Returns
+        -------
+        object
+            result of the job, e.g. the solved model, None if the job did not
+            finish successfully.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.active:
+                return None
+            del self._jobs[job_id]
+            return job.result
+
+    def cancel(self, job_id):
+        """Cancel a job, terminating the worker process if it is running.
+
+        Parameters
+        ----------
+        job_id : str
+            identifier of the job
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.active:
+                self._cancel(job)
+        self._wakeup.set()
+
+    def _cancel(self, job):
+        if job.status == "queued":
+            self._queue.remove(job)
+        else:
+            # the dispatcher cleans up once the process has stopped
+            job.process.terminate()
+        job.status = "cancelled"
+        job.finished = time.monotonic()
+        job.args = job.kwargs = None
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+            self._dispatcher.start()
+
+    def _start(self, job):
+        if self._ctx is None:
+            self._ctx = get_mp_context()
+        recv, send = self._ctx.Pipe(duplex=False)
+        job.process = self._ctx.Process(
+            target=_run_job,
+            args=(send, job.func, job.args, job.kwargs),
+            daemon=True,
+        )
+        job.process.start()
+        send.close()
+        job.conn = recv
+        job.status = "running"
+        job.started = time.monotonic()
+        job.args = job.kwargs = None
+        self._running[recv] = job
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.abandon_timeout:
+                    for job in list(self._queue) + list(self._running.values()):
+                        if job.active and now - job.last_seen > self.abandon_timeout:
+                            logger.info("Cancelling abandoned solve job %s.", job.name)
+                            self._cancel(job)
+                while self._queue and len(self._running) < self.max_workers:
+                    self._start(self._queue.popleft())
+                conns = list(self._running)
+                # remove finished jobs whose result was never collected
+                for job_id, job in list(self._jobs.items()):
+                    if not job.active and now - job.finished > 10 * (
+                        self.abandon_timeout or 60
+                    ):
+                        del self._jobs[job_id]
+                if not conns and not self._queue:
+                    self._dispatcher = None
+                    return
+
+            self._wakeup.clear()
+            ready = wait(conns, timeout=0.5) if conns else []
+            if not conns:
+                self._wakeup.wait(0.5)
+
+            with self._lock:
+                for conn in ready:
+                    job = self._running.pop(conn)
+                    if job.status == "cancelled":
+                        conn.close()
+                        job.process.join(timeout=1)
+                        continue
+                    try:
+                        job.status, value = conn.recv()
+                    except (EOFError, OSError):
+                        job.status, value = "failed", "Worker process stopped."
+                    if job.status == "done":
+                        job.result = value
+                    else:
+                        job.error = value
+                    job.finished = time.monotonic()
+                    conn.close()
+                    job.process.join(timeout=1)
+
+
+class BatchSolveJob:
+    """State of a batch solve.
+
+    Parameters
+    ----------
+    job_id : str
+        identifier of the job
+    names : list of str
+        names of the models to solve
+    """
+
+    def __init__(self, job_id, names):
+        self.job_id = job_id
+        self.names = names
+        self.status = "running"
+        self.results = []
+        self.error = None
+        self.started = time.monotonic()
+        self.finished = None
+        self.cancelled = threading.Event()
+
+    def to_dict(self):
+        end = self.finished if self.finished is not None else time.monotonic()
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "done": len(self.results),
+            "total": len(self.names),
+            "failed": sum(r["status"] == "failed" for r in self.results),
+            "elapsed": end - self.started,
+            "error": self.error,
+        }
+
+
+class BatchSolver:
+    """Solve many models on a process pool and write them to the PastaStore.
+
+    Models are read in chunks in a background thread and solved in worker
+    processes. Only a chunk per worker is submitted at a time, so reading
+    models keeps pace with solving them and models are not all held in memory.
+    Each model is written to the PastaStore after it was solved successfully,
+    models that fail to solve are left unchanged. Only a single batch runs at a
+    time.
+
+    Parameters
+    ----------
+    read : callable
+        function that reads the models for a list of names
+    write : callable
+        function that writes a solved model to the PastaStore
+    max_workers : int, optional
+        number of worker processes, by default None, which uses the number of
+        CPUs.
+    chunksize : int, optional
+        number of models per chunk, by default 10
+    """
+
+    def __init__(self, read, write, max_workers=None, chunksize=10):
+        self.read = read
+        self.write = write
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = max(int(chunksize), 1)
+        self._jobs = {}
+        self._current = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        """Whether a batch is running."""
+        return self._current is not None and self._current.status == "running"
+
+    def start(self, names, tmin=None, tmax=None, warm_start=False):
+        """Start solving models in the background.
+
+        Parameters
+        ----------
+        names : list of str
+            names of the models to solve
+        tmin : pandas.Timestamp, optional
+            start of the calibration period, by default None, which uses the
+            period of the observations.
+        tmax : pandas.Timestamp, optional
+            end of the calibration period, by default None, which uses the
+            period of the observations.
+        warm_start : bool, optional
+            start solving from the optimal parameters of the stored models, see
+            `solve_model`, by default False
+
+        Returns
+        -------
+        str
+            identifier of the job
+
+        Raises
+        ------
+        RuntimeError
+            if a batch is already running
+        """
+        with self._lock:
+            if self.running:
+                raise RuntimeError(
+                    "Another batch of models is being solved, wait for it to "
+                    "finish or cancel it."
+                )
+            job = BatchSolveJob(uuid.uuid4().hex, list(names))
+            # only keep the state of the last few jobs
+            for job_id in list(self._jobs)[:-9]:
+                del self._jobs[job_id]
+            self._jobs[job.job_id] = job
+            self._current = job
+        func = partial(solve_model, warm_start=warm_start)
+        threading.Thread(
+            target=self._run, args=(job, tmin, tmax, func), daemon=True
+        ).start()
+        return job.job_id
+
+    def progress(self, job_id):
+        """Get progress of a job.
+
+        Parameters
+        ----------
+        job_id : str
+            identifier of the job
+
+        Returns
+        -------
+        dict or None
+            dictionary containing the status ("running", "done", "cancelled" or
+            "failed"), the number of solved, failed and total models, the
+            elapsed time and the error message if the job failed. None if the
+            job is unknown.
+        """
+        job = self._jobs.get(job_id)
+        return None if job is None else job.to_dict()
+
+    def results(self, job_id):
+        """Get name, status, solve time and error for each model of a job.
+
+        Parameters
+        ----------
+        job_id : str
+            identifier of the job
+
+        Returns
+        -------
+        list of dict
+            results per model, models that were not solved because the job was
+            cancelled or failed are included with status "cancelled"
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return []
+        results = list(job.results)
+        if job.status != "running":
+            solved = {r["name"] for r in results}
+            results += [
+                {"name": n, "status": "cancelled", "time": None, "error": None}
+                for n in job.names
+                if n not in solved
+            ]
+        return results
+
+    def cancel(self, job_id=None):
+        """Cancel a job.
+
+        Models that were already solved are kept.
+
+        Parameters
+        ----------
+        job_id : str, optional
+            identifier of the job, by default None, which cancels the running job
+        """
+        job = self._current if job_id is None else self._jobs.get(job_id)
+        if job is not None:
+            job.cancelled.set()
+
+    def _store(self, job, results):
+        for name, ml, elapsed, error in results:
+            if ml is not None:
+                try:
+                    self.write(ml)
+                except Exception as e:
+                    error = f"Could not write model: {e}"
+            job.results.append(
+                {
+                    "name": name,
+                    "status": "failed" if error else "solved",
+                    "time": elapsed,
+                    "error": error,
+                }
+            )
+
+    def _read(self, job, chunk):
+        try:
+            return dict(zip(chunk, self.read(chunk), strict=True))
+        except Exception:
+            pass
+        # read models separately, so only models that cannot be read fail
+        models = {}
+        for name in chunk:
+            try:
+                models[name] = self.read([name])[0]
+            except Exception as e:
+                error = f"Could not read model: {type(e).__name__}: {e}"
+                self._store(job, [(name, None, None, error)])
+        return models
+
+    def _run(self, job, tmin, tmax, func):
+        chunks = iter(
+            [
+                job.names[i : i + self.chunksize]
+                for i in range(0, len(job.names), self.chunksize)
+            ]
+        )
+        pending = {}
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=get_mp_context()
+        )
+
+        def submit_next():
+            for chunk in chunks:
+                if job.cancelled.is_set():
+                    return
+                models = self._read(job, chunk)
+                if not models:
+                    continue
+                future = pool.submit(
+                    solve_models, models, tmin=tmin, tmax=tmax, func=func
+                )
+                pending[future] = chunk
+                return
+
+        status = "done"
+        try:
+            for _ in range(self.max_workers):
+                submit_next()
+            while pending and not job.cancelled.is_set():
+                finished, _ = wait_futures(
+                    pending, timeout=0.5, return_when=FIRST_COMPLETED
+                )
+                for future in finished:
+                    pending.pop(future)
+                    self._store(job, future.result())
+                    submit_next()
+            if job.cancelled.is_set():
+                status = "cancelled"
+        except Exception as e:
+            logger.exception("Batch solve failed.")
+            status = "failed"
+            job.error = str(e)
+        finally:
+            # chunks that are still being solved are discarded, the job is
+            # running until the workers are gone, so a new batch cannot start
+            # while they still occupy the CPUs
+            shutdown_pool(pool, terminate=bool(pending))
+            job.finished = time.monotonic()
+            job.status = status
@@ -0,0 +1,110 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from scipy.spatial import cKDTree
+
+
+class SpatialIndex:
+    """Spatial index of point locations of time series.
+
+    Uses an R-tree on lon/lat for selecting points within a bounding box or
+    polygon drawn on the map, and a KD-tree on the projected x/y coordinates for
+    finding the nearest points. Points without coordinates are not indexed.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        metadata of the time series, indexed by name
+    x : str, optional
+        name of the column containing the x-coordinates, by default "x"
+    y : str, optional
+        name of the column containing the y-coordinates, by default "y"
+    lon : str, optional
+        name of the column containing the longitudes, by default "lon"
+    lat : str, optional
+        name of the column containing the latitudes, by default "lat"
+    """
+
+    def __init__(self, df, x="x", y="y", lon="lon", lat="lat"):
+        lonlat = df.loc[df[lon].notna() & df[lat].notna(), [lon, lat]]
+        self.points = gpd.GeoSeries(
+            gpd.points_from_xy(lonlat[lon], lonlat[lat]), index=lonlat.index
+        )
+        self.rtree = self.points.sindex
+
+        xy = df.loc[df[x].notna() & df[y].notna(), [x, y]]
+        self.xy_names = xy.index
+        self.kdtree = cKDTree(xy.to_numpy(dtype=float)) if not xy.empty else None
+
+    def __len__(self):
+        return self.points.index.size
+
+    def query_bbox(self, bounds):
+        """Get names of points within bounding box.
+
+        Parameters
+        ----------
+        bounds : tuple of float
+            lon_min, lat_min, lon_max, lat_max
+
+        Returns
+        -------
+        pandas.Index
+            names of the points within the bounding box
+        """
+        return self.query_geometry(shapely.box(*bounds))
+
+    def query_polygon(self, coordinates):
+        """Get names of points within polygon.
+
+        Parameters
+        ----------
+        coordinates : list of (lon, lat)
+            vertices of the polygon
+
+        Returns
+        -------
+        pandas.Index
+            names of the points within the polygon
+        """
+        if len(coordinates) < 3:
+            return self.points.index[:0]
+        return self.query_geometry(shapely.Polygon(coordinates))
+
+    def query_geometry(self, geometry):
+        """Get names of points intersecting geometry in lon/lat."""
+        idx = self.rtree.query(geometry, predicate="intersects")
+        return self.points.index[np.sort(idx)]
+
+    def nearest(self, x, y, k=1, max_distance=np.inf):
+        """Get the k nearest points to a location.
+
+        Parameters
+        ----------
+        x : float
+            x-coordinate of the location
+        y : float
+            y-coordinate of the location
+        k : int, optional
+            number of points, by default 1
+        max_distance : float, optional
+            only return points within this distance, by default inf
+
+        Returns
+        -------
+        pandas.Series
+            distance to the nearest points, indexed by name and sorted by distance
+        """
+        if self.kdtree is None:
+            return pd.Series(dtype=float, name="distance")
+        k = min(k, self.xy_names.size)
+        distance, idx = self.kdtree.query(
+            [x, y], k=k, distance_upper_bound=max_distance
+        )
+        distance, idx = np.atleast_1d(distance), np.atleast_1d(idx)
+        # missing neighbours are returned with an index equal to the number of points
+        mask = idx < self.xy_names.size
+        return pd.Series(
+            distance[mask], index=self.xy_names[idx[mask]], name="distance"
+        )
@@ -1,8 +1,12 @@
 # ruff: noqa: F401
+from pastasdash.application.utils.clustering import PointClusters, get_viewport
 from pastasdash.application.utils.utils import (
     add_latlon_to_dataframe,
+    allocate_point_budget,
     conditional_decorator,
     derive_input_parameters,
+    downsample_timeseries,
+    encode_array,
     get_plotting_zoom_level_and_center_coordinates,
     get_transformer,
     temporary_file,
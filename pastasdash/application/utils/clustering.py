@@ -0,0 +1,165 @@
+import numpy as np
+
+# size of map tiles in pixels, the world is 512 * 2**zoom pixels wide
+TILE_SIZE = 512
+# assumed size of the map in pixels, if the map bounds are unknown
+DEFAULT_MAP_SIZE = (1200, 600)
+
+
+def lonlat_to_world(lon, lat):
+    """Convert lon/lat to web mercator world coordinates between 0 and 1.
+
+    Parameters
+    ----------
+    lon : array-like
+        longitudes
+    lat : array-like
+        latitudes
+
+    Returns
+    -------
+    x, y : numpy.ndarray
+        world coordinates, y increases southwards
+    """
+    lon = np.asarray(lon, dtype=float)
+    lat = np.clip(np.asarray(lat, dtype=float), -85.0511, 85.0511)
+    x = (lon + 180.0) / 360.0
+    y = 0.5 - np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) / (2 * np.pi)
+    return x, y
+
+
+def get_viewport(relayout_data=None, center=None, zoom=None):
+    """Get map bounds and zoom level from relayoutData or center and zoom.
+
+    Parameters
+    ----------
+    relayout_data : dict, optional
+        relayoutData of a scattermap figure
+    center : dict, optional
+        map center containing lon and lat, used if relayout_data is None
+    zoom : float, optional
+        zoom level, used if relayout_data is None
+
+    Returns
+    -------
+    dict or None
+        dictionary containing bounds (lon_min, lat_min, lon_max, lat_max) and
+        zoom, or None if the viewport cannot be determined.
+    """
+    if relayout_data is not None:
+        center = relayout_data.get("map.center")
+        zoom = relayout_data.get("map.zoom")
+        derived = relayout_data.get("map._derived", {})
+        if "coordinates" in derived and zoom is not None:
+            coords = np.asarray(derived["coordinates"], dtype=float)
+            bounds = (
+                coords[:, 0].min(),
+                coords[:, 1].min(),
+                coords[:, 0].max(),
+                coords[:, 1].max(),
+            )
+            return {"bounds": bounds, "zoom": zoom}
+    if center is None or zoom is None:
+        return None
+    # estimate bounds from center and zoom level
+    size = TILE_SIZE * 2**zoom
+    x, y = lonlat_to_world(center["lon"], center["lat"])
+    dx = DEFAULT_MAP_SIZE[0] / 2 / size
+    dy = DEFAULT_MAP_SIZE[1] / 2 / size
+    lon_min, lon_max = 360.0 * (x - dx) - 180.0, 360.0 * (x + dx) - 180.0
+    lat_max, lat_min = np.degrees(
+        2 * np.arctan(np.exp(2 * np.pi * (0.5 - np.array([y - dy, y + dy]))))
+        - np.pi / 2
+    )
+    return {"bounds": (lon_min, lat_min, lon_max, lat_max), "zoom": zoom}
+
+
+class PointClusters:
+    """Hierarchical grid clustering of map points.
+
+    For each zoom level, points are assigned to square grid cells in web
+    mercator coordinates with a size of `radius` pixels. The grid cells at each
+    zoom level are nested in the cells of the zoom level below, so the clusters
+    form a hierarchy. The clustering is computed once, after which viewport
+    queries only require indexing.
+
+    Parameters
+    ----------
+    lon : array-like
+        longitudes of points
+    lat : array-like
+        latitudes of points
+    radius : int, optional
+        size of grid cells in pixels, by default 40
+    max_zoom : int, optional
+        zoom level above which points are never clustered, by default 16
+    """
+
+    def __init__(self, lon, lat, radius=40, max_zoom=16):
+        self.lon = np.asarray(lon, dtype=float)
+        self.lat = np.asarray(lat, dtype=float)
+        self.radius = radius
+        self.max_zoom = max_zoom
+        x, y = lonlat_to_world(self.lon, self.lat)
+        self.labels = []
+        self.counts = []
+        self.centers = []
+        for zoom in range(max_zoom + 1):
+            ncells = TILE_SIZE * 2**zoom / radius
+            ix = np.floor(x * ncells).astype(np.int64)
+            iy = np.floor(y * ncells).astype(np.int64)
+            _, labels, counts = np.unique(
+                ix * (int(ncells) + 1) + iy, return_inverse=True, return_counts=True
+            )
+            center_lon = np.bincount(labels, weights=self.lon) / counts
+            center_lat = np.bincount(labels, weights=self.lat) / counts
+            self.labels.append(labels)
+            self.counts.append(counts)
+            self.centers.append((center_lon, center_lat))
+
+    def __len__(self):
+        return self.lon.size
+
+    def in_bounds(self, lon, lat, bounds):
+        """Get mask of coordinates within bounds."""
+        lon_min, lat_min, lon_max, lat_max = bounds
+        return (lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max)
+
+    def query(self, bounds, zoom, max_points=0):
+        """Get points and clusters visible in the viewport.
+
+        Parameters
+        ----------
+        bounds : tuple of float
+            lon_min, lat_min, lon_max, lat_max of the viewport
+        zoom : float
+            zoom level of the map
+        max_points : int, optional
+            all visible points are returned without clustering if there are fewer
+            than max_points, by default 0.
+
+        Returns
+        -------
+        points : numpy.ndarray
+            indices of visible points that are not part of a cluster, in
+            ascending order
+        clusters : dict
+            dictionary containing lon, lat and count of visible clusters
+        """
+        zoom = int(np.clip(np.floor(zoom), 0, self.max_zoom))
+        visible = self.in_bounds(self.lon, self.lat, bounds)
+        no_clusters = {"lon": np.array([]), "lat": np.array([]), "count": np.array([])}
+        if zoom == self.max_zoom or visible.sum() <= max_points:
+            return np.flatnonzero(visible), no_clusters
+
+        labels = self.labels[zoom]
+        counts = self.counts[zoom]
+        center_lon, center_lat = self.centers[zoom]
+        points = np.flatnonzero(visible & (counts[labels] == 1))
+        mask = (counts > 1) & self.in_bounds(center_lon, center_lat, bounds)
+        clusters = {
+            "lon": center_lon[mask],
+            "lat": center_lat[mask],
+            "count": counts[mask],
+        }
+        return points, clusters
@@ -1,10 +1,15 @@
+import base64
+import functools
 import os
 import tempfile
 from contextlib import contextmanager
 
 import numpy as np
+import pandas as pd
 from pyproj import Transformer
 
+from pastasdash.application.settings import settings
+
 
 def conditional_decorator(dec, condition, **kwargs):
     def decorator(func):
@@ -75,7 +80,9 @@ def get_plotting_zoom_level_and_center_coordinates(longitudes=None, latitudes=No
     return zoom, b_box["center"]
 
 
+@functools.lru_cache
 def get_transformer(crs_from, crs_to):
+    """Get (cached) coordinate transformer between two coordinate systems."""
     transformer = Transformer.from_crs(crs_from, crs_to, always_xy=False)
     return transformer
 
@@ -90,6 +97,121 @@ def add_latlon_to_dataframe(
     return df
 
 
+def downsample_timeseries(series, max_points):
+    """Downsample time series by keeping the minimum and maximum per bucket.
+
+    The series is divided into buckets with an equal number of observations, and
+    only the minimum and maximum value in each bucket are kept. This preserves the
+    envelope of the series, including peaks, when plotting.
+
+    Parameters
+    ----------
+    series : pandas.Series
+        time series to downsample
+    max_points : int
+        maximum number of points in the downsampled series, no downsampling is
+        applied if this is 0 or None.
+
+    Returns
+    -------
+    pandas.Series
+        downsampled time series
+    """
+    series = series.dropna()
+    n = series.index.size
+    if not max_points or n <= max_points:
+        return series
+    bucket_size = int(np.ceil(n / max(max_points // 2 - 1, 1)))
+    n_buckets = int(np.ceil(n / bucket_size))
+    values = np.full(n_buckets * bucket_size, np.nan)
+    values[:n] = series.to_numpy(dtype=float)
+    # pad with NaNs to fill the last bucket, padding is smaller than a bucket
+    buckets = values.reshape(n_buckets, bucket_size)
+    offset = np.arange(n_buckets) * bucket_size
+    imin = offset + np.nanargmin(buckets, axis=1)
+    imax = offset + np.nanargmax(buckets, axis=1)
+    positions = np.unique(np.concatenate([[0, n - 1], imin, imax]))
+    return series.iloc[positions]
+
+
+def allocate_point_budget(sizes, budget):
+    """Divide a point budget over multiple time series.
+
+    Series smaller than an equal share of the budget are kept in full, and the
+    remaining budget is divided equally over the larger series.
+
+    Parameters
+    ----------
+    sizes : list of int
+        number of observations in each time series
+    budget : int
+        total number of points, no limit is applied if this is 0 or None.
+
+    Returns
+    -------
+    list of int
+        maximum number of points for each time series, 0 means no limit.
+    """
+    if not budget or sum(sizes) <= budget:
+        return [0] * len(sizes)
+    max_points = [0] * len(sizes)
+    remaining = budget
+    order = np.argsort(sizes)
+    for i, idx in enumerate(order):
+        share = remaining // (len(sizes) - i)
+        if sizes[idx] <= share:
+            remaining -= sizes[idx]
+        else:
+            # series is downsampled, minimum of 4 points to keep first, last and
+            # the envelope
+            max_points[idx] = max(share, 4)
+            remaining -= max_points[idx]
+    return max_points
+
+
+def encode_array(values):
+    """Encode array as plotly base64 typed array.
+
+    Numeric arrays are encoded as `{"dtype": ..., "bdata": ...}`, which is much
+    smaller and faster to serialize than a list of floats. Datetime arrays are
+    encoded as milliseconds since epoch, these are only interpreted as dates on axes
+    with type "date". Other arrays are returned unchanged. Encoding is only applied
+    if `BINARY_ENCODING` is enabled in the settings.
+
+    Parameters
+    ----------
+    values : array-like
+        values to encode
+
+    Returns
+    -------
+    dict or array-like
+        typed array specification, or the original values
+    """
+    if not settings["BINARY_ENCODING"]:
+        return values
+    if isinstance(getattr(values, "dtype", None), pd.DatetimeTZDtype):
+        # plot wall clock time
+        values = pd.DatetimeIndex(values).tz_localize(None)
+    arr = np.asarray(values)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        arr = arr.astype("datetime64[ms]").astype(np.int64).astype(np.float64)
+    elif np.issubdtype(arr.dtype, np.bool_):
+        arr = arr.astype(np.uint8)
+    elif np.issubdtype(arr.dtype, np.integer) and arr.dtype.itemsize <= 4:
+        pass
+    elif np.issubdtype(arr.dtype, np.number):
+        # plotly.js does not support 64-bit integers
+        arr = arr.astype(np.float64)
+    else:
+        return values
+    arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("<"))
+    return {
+        "dtype": arr.dtype.str[1:],
+        "bdata": base64.b64encode(arr.tobytes()).decode("ascii"),
+    }
+
+
 def derive_input_parameters(v, precision=2):
     """Derive form parameters based on the type and value of the input.
 